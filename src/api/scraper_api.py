@@ -22,10 +22,15 @@ from src.ingestion.instagram_web import (
 from src.ingestion.youtube import get_youtube_comments
 from src.ingestion.reddit import get_reddit_comments
 
+from src.ingestion.browser_pool import close_pools
+
 from src.storage.csv_exporter import save_csv, export_comments_batch
 
 app = FastAPI(title="Scraper API", version="1.0.0")
 
+# Navegadores ficam quentes entre requisições (ingestion/browser_pool.py); fecha tudo ao parar
+app.add_event_handler("shutdown", close_pools)
+
 # Helper: converte DataFrame para JSON
 def df_to_json(df: pd.DataFrame):
     return df.to_dict(orient="records")
@@ -64,6 +69,7 @@ def twitter_web_much(body: dict = Body(...), limit: int = 10, save: bool = False
 def instagram_web_one(user: str, password: str, mode: str, id: str, limit: int = 10, save: bool = False):
     data = scrape_instagram_one(user, password, mode, id, limit)
     df = pd.DataFrame(data)
+    csv_path = None
     if save:
         csv_path = save_csv(df, platform="instagram", identifier=id, kind=mode)
     response = df_to_json(df)
@@ -0,0 +1,288 @@
+"""
+src/backfill.py
+Re-pontua comentários já armazenados (ex.: depois de uma mudança no vocabulário)
+usando vários processos.
+
+- Entrada: JSONL de CommentRecord (--input) ou uma coleção do Firestore (--from-firestore).
+- A entrada é fatiada em shards de --shard-size comentários, distribuídos a --workers processos.
+- Cada worker carrega spaCy/modelo uma única vez e pontua com build_stages + score_texts,
+  exatamente como o run_pipeline, então os rótulos são os mesmos.
+- A matriz de exemplos do vocab é montada uma vez no processo pai (memmap do cache de
+  exemplos) e herdada pelos workers via fork, sem cópia (copy-on-write).
+- Os resultados voltam na ordem da entrada (Pool.imap) e são gravados conforme chegam.
+
+Uso:
+    python backfill.py --input comentarios.jsonl --out rescored.jsonl --workers 16
+    python backfill.py --from-firestore comments --persist
+"""
+
+import argparse
+import dataclasses
+import glob
+import json
+import logging
+import multiprocessing as mp
+import os
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from common.config import load_settings
+from common.models import CommentRecord
+from services.vocab_client import fetch_vocab
+from classify.scoring import ENCODER_MODEL, CascadeStats, build_stages, score_options, score_texts
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger("backfill")
+
+# Estado do processo pai herdado pelos workers no fork
+_SETTINGS = None
+_VOCAB: Dict[str, Any] = {}
+_EXAMPLES_EMB = None
+
+# Estado de cada worker (preenchido em _init_worker)
+_STAGES = None
+_WORKER_SETTINGS = None
+
+
+def _encode_examples(nlp_cfg: Dict[str, Any], texts: List[str]):
+    """Roda em um processo 'spawn' descartável: o pai nunca carrega torch/onnxruntime."""
+    from semantic.encoder import SemanticEncoder
+    from semantic.backends import build_backend
+
+    enc = SemanticEncoder(ENCODER_MODEL, [], backend=build_backend(ENCODER_MODEL, nlp_cfg))
+    return enc._encode(texts, batch_size=64)
+
+
+def _examples_matrix(settings, vocab: Dict[str, Any]):
+    """Matriz de exemplos do vocab, codificada fora do pai e, se possível, vinda do cache em disco."""
+    from semantic.backends import backend_id
+    from semantic.example_cache import load_or_build
+
+    examples = vocab.get("examples_implicit", [])
+    if not examples:
+        return None
+
+    def encode(texts: List[str]):
+        with mp.get_context("spawn").Pool(1) as pool:
+            return pool.apply(_encode_examples, (settings.nlp, texts))
+
+    cache_dir = settings.nlp.get("examples_cache_dir")
+    if cache_dir and vocab.get("version"):
+        return load_or_build(
+            examples,
+            encode,
+            model_name=backend_id(ENCODER_MODEL, settings.nlp),
+            version=vocab["version"],
+            normalize=True,
+            cache_dir=cache_dir,
+        )
+    return encode(examples)
+
+
+def _worker_cache_glob(path: str, parent_pid: int) -> str:
+    return f"{path}.backfill-{parent_pid}-*"
+
+
+def _worker_settings(settings, threads: int, workers: int = 1):
+    # Os caches persistentes (SQLite do pré-processamento, memmap de embeddings)
+    # supõem um único escritor; nos workers ficam só em memória.
+    nlp = dict(settings.nlp, cache_path=None, embedding_cache_dir=None, onnx_threads=threads)
+    services = dict(settings.services)
+    # Cada worker tem seu token bucket: a cota da Perspective é dividida entre eles
+    services["perspective_qps"] = float(services.get("perspective_qps", 1.0)) / max(1, workers)
+    path = services.get("perspective_cache_path")
+    if path:
+        # Cache da Perspective: cada worker grava no seu arquivo e lê o principal só para
+        # leitura; o pai incorpora os arquivos no principal ao final (_merge_perspective_caches)
+        services["perspective_cache_path"] = f"{path}.backfill-{os.getppid()}-{os.getpid()}"
+        services["perspective_cache_base_path"] = path
+    return dataclasses.replace(settings, nlp=nlp, services=services)
+
+
+def _merge_perspective_caches(settings):
+    path = settings.services.get("perspective_cache_path")
+    parts = sorted(glob.glob(_worker_cache_glob(path, os.getpid()))) if path else []
+    if not parts:
+        return
+    from services.perspective_cache import PerspectiveCache
+
+    cache = PerspectiveCache(
+        path,
+        ttl_days=float(settings.services.get("perspective_cache_ttl_days", 30)),
+        max_entries=int(settings.services.get("perspective_cache_max_entries", 200_000)),
+    )
+    try:
+        merged = cache.merge(parts)
+        cache.prune()
+    finally:
+        cache.close()
+    for part in parts:
+        os.remove(part)
+    logger.info("Cache da Perspective → %d scores novos incorporados de %d workers", merged, len(parts))
+
+
+def _init_worker(threads: int, workers: int):
+    global _STAGES, _WORKER_SETTINGS
+    settings = _WORKER_SETTINGS = _worker_settings(_SETTINGS, threads, workers)
+    if settings.nlp.get("encoder_backend", "torch") == "torch":
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    _STAGES = build_stages(settings, _VOCAB, n_process=1, examples_emb=_EXAMPLES_EMB)
+
+
+def _score_shard(shard: List[Dict[str, Any]]):
+    pre, rules, enc = _STAGES
+    stats = CascadeStats()
+    scored_all = score_texts(
+        [doc.get("text") or "" for doc in shard],
+        pre,
+        rules,
+        enc,
+        _SETTINGS.thresholds,
+        stats=stats,
+        **score_options(_WORKER_SETTINGS),
+    )
+
+    examples = _VOCAB.get("examples_implicit", [])
+    records: List[CommentRecord] = []
+    for doc, scored in zip(shard, scored_all):
+        extras = {k: v for k, v in (doc.get("extras") or {}).items()
+                  if k not in ("cascade_skipped", "semantic_example", "dup_cluster",
+                               "dup_cluster_size", "dup_inherited")}
+        if scored.skipped:
+            extras["cascade_skipped"] = scored.skipped
+        if scored.semantic_example is not None:
+            extras["semantic_example"] = examples[scored.semantic_example]
+        if scored.cluster is not None:
+            # Campanha/copypasta: id do cluster = comment_id do representante
+            extras["dup_cluster"] = shard[scored.cluster].get("comment_id")
+            extras["dup_cluster_size"] = scored.cluster_size
+            if scored.duplicate_of is not None:
+                extras["dup_inherited"] = True
+
+        records.append(CommentRecord(
+            platform=doc.get("platform"),
+            source_id=doc.get("source_id"),
+            comment_id=doc.get("comment_id"),
+            author=doc.get("author"),
+            text=doc.get("text") or "",
+            preprocessed=scored.preprocessed,
+            rule_hits=scored.rule_hits,
+            semantic_score=scored.semantic_score,
+            perspective_sexual=scored.perspective_sexual,
+            final_score=scored.final_score,
+            classification=scored.classification,
+            extras=extras,
+            vocab_version=_VOCAB.get("version"),
+        ))
+    return records, stats
+
+
+def _read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _shards(docs: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    it = iter(docs)
+    while True:
+        shard = list(islice(it, size))
+        if not shard:
+            return
+        yield shard
+
+
+def run_backfill(args) -> Dict[str, int]:
+    global _SETTINGS, _VOCAB, _EXAMPLES_EMB
+    _SETTINGS = load_settings()
+
+    logger.info("Buscando vocabulário na Vocab API...")
+    _VOCAB = fetch_vocab()
+    _EXAMPLES_EMB = _examples_matrix(_SETTINGS, _VOCAB)
+    logger.info(
+        "Vocab OK (version=%s). EX=%d",
+        _VOCAB.get("version"), 0 if _EXAMPLES_EMB is None else len(_EXAMPLES_EMB),
+    )
+
+    workers = args.workers or os.cpu_count() or 1
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+
+    counts = {"total": 0, "suspeito": 0, "atencao": 0, "ok": 0}
+    totals = CascadeStats()
+    t0 = time.perf_counter()
+    logger.info("Backfill: %d workers x %d threads | shard=%d", workers, threads, args.shard_size)
+    try:
+        ctx = mp.get_context("fork")
+        with ctx.Pool(workers, initializer=_init_worker, initargs=(threads, workers)) as pool:
+            # O cliente do Firestore (gRPC) não sobrevive a fork: só é criado com os workers já
+            # no ar, e os workers nunca o usam (gravação e leitura ficam no pai)
+            fs = None
+            if args.from_firestore or args.persist:
+                from storage.firestore import get_client, iter_documents, save_records
+
+                fs = get_client()
+            if args.from_firestore:
+                docs = iter_documents(fs, args.from_firestore)
+            else:
+                docs = _read_jsonl(args.input)
+
+            for records, stats in pool.imap(_score_shard, _shards(docs, args.shard_size)):
+                for f in dataclasses.fields(CascadeStats):
+                    setattr(totals, f.name, getattr(totals, f.name) + getattr(stats, f.name))
+                for r in records:
+                    counts["total"] += 1
+                    counts[r.classification] = counts.get(r.classification, 0) + 1
+                    if out is not None:
+                        out.write(json.dumps(r.to_dict(), ensure_ascii=False, default=str) + "\n")
+                if args.persist:
+                    save_records(fs, args.collection, records)
+                logger.info("[Backfill] %d comentários (%.1f/s)",
+                            counts["total"], counts["total"] / (time.perf_counter() - t0))
+    finally:
+        if out is not None:
+            out.close()
+        _merge_perspective_caches(_SETTINGS)
+
+    logger.info(
+        "Resumo → total=%d | suspeito=%d | atencao=%d | ok=%d",
+        counts["total"], counts["suspeito"], counts["atencao"], counts["ok"],
+    )
+    logger.info(
+        "Cascata → semântico: %d chamadas (%d evitadas) | Perspective: %d chamadas (%d evitadas)",
+        totals.semantic_calls, totals.semantic_saved,
+        totals.perspective_calls, totals.perspective_saved,
+    )
+    logger.info("Quase-duplicatas → %d comentários herdaram o score do representante", totals.duplicates)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Re-pontua comentários armazenados em paralelo.")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--input", help="JSONL com um CommentRecord (ou {comment_id, text, ...}) por linha")
+    src.add_argument("--from-firestore", metavar="COLLECTION", help="Lê todos os documentos da coleção")
+
+    parser.add_argument("--out", help="Grava os registros re-pontuados neste JSONL")
+    parser.add_argument("--persist", action="store_true", help="Upsert dos resultados no Firestore")
+    parser.add_argument("--collection", default="comments", help="Coleção de destino do --persist (default=comments)")
+    parser.add_argument("--workers", type=int, default=0, help="Processos (default=nº de CPUs)")
+    parser.add_argument("--shard-size", type=int, default=512, help="Comentários por shard (default=512)")
+    args = parser.parse_args(argv)
+
+    if not (args.out or args.persist):
+        parser.error("Informe --out e/ou --persist")
+
+    run_backfill(args)
+
+
+if __name__ == "__main__":
+    main()
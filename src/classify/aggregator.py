@@ -30,11 +30,72 @@ def aggregate_risk(
     if perspective_sexual is not None:
         final_score += perspective_sexual * float(perspective_weight)
 
+    return final_score, label_for_score(final_score, decision)
+
+
+def label_for_score(final_score: float, decision: float) -> str:
     if final_score >= decision:
-        label = "suspeito"
-    elif final_score >= (decision * 0.6):
-        label = "atencao"
-    else:
-        label = "ok"
+        return "suspeito"
+    if final_score >= (decision * 0.6):
+        return "atencao"
+    return "ok"
+
+
+def score_bounds(
+    rule_hits: List[str],
+    thresholds: dict,
+    semantic_score: Optional[float] = None,
+    perspective_sexual: Optional[float] = None,
+    perspective_pending: bool = False,
+    perspective_weight: float = 0.4
+) -> Tuple[float, float]:
+    """
+    Menor e maior final_score possíveis dado o que já se sabe.
+    - semantic_score=None: sinal semântico ainda não calculado (contribui 0 ou semantic_weight)
+    - perspective_pending: Perspective ainda não chamada (contribui entre 0 e perspective_weight)
+    """
+    base, _ = aggregate_risk(
+        rule_hits=rule_hits,
+        # pendente: conta como "abaixo do threshold" na base e entra no intervalo abaixo
+        semantic_score=semantic_score if semantic_score is not None else float("-inf"),
+        thresholds=thresholds,
+        perspective_sexual=perspective_sexual,
+        perspective_weight=perspective_weight,
+    )
+    low = high = base
+
+    if semantic_score is None:
+        semantic_weight = float(thresholds.get("semantic_weight", 0.6))
+        low += min(0.0, semantic_weight)
+        high += max(0.0, semantic_weight)
 
-    return final_score, label
+    if perspective_pending:
+        low += min(0.0, float(perspective_weight))
+        high += max(0.0, float(perspective_weight))
+
+    return low, high
+
+
+def decided_label(
+    rule_hits: List[str],
+    thresholds: dict,
+    semantic_score: Optional[float] = None,
+    perspective_sexual: Optional[float] = None,
+    perspective_pending: bool = False,
+    perspective_weight: float = 0.4
+) -> Optional[str]:
+    """
+    Modo cascata: devolve o label se nenhum sinal pendente consegue mais mudá-lo
+    (cruzar decision ou decision * 0.6); None se ainda vale a pena calcular o sinal.
+    """
+    decision = float(thresholds.get("decision", 0.9))
+    low, high = score_bounds(
+        rule_hits,
+        thresholds,
+        semantic_score=semantic_score,
+        perspective_sexual=perspective_sexual,
+        perspective_pending=perspective_pending,
+        perspective_weight=perspective_weight,
+    )
+    label = label_for_score(low, decision)
+    return label if label == label_for_score(high, decision) else None
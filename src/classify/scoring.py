@@ -0,0 +1,284 @@
+"""
+src/classify/scoring.py
+Estágios de pontuação de um lote de comentários, na ordem de custo:
+pré-processamento → regras → semântico → Perspective → agregação.
+Compartilhado pelo main (run_pipeline), smoke test e backfill, para que
+todos montem os estágios e pontuem exatamente do mesmo jeito.
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from classify.aggregator import aggregate_risk, decided_label
+from services.perspective import get_sexually_explicit_scores
+
+logger = logging.getLogger("classify.scoring")
+
+ENCODER_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+
+def build_stages(settings, vocab: Dict[str, Any], n_process: Optional[int] = None, examples_emb=None) -> Tuple:
+    """
+    (Preprocessor, RuleEngine, SemanticEncoder) configurados a partir do settings.yaml
+    e do vocabulário. examples_emb pronto (ex.: herdado do processo pai) evita
+    recodificar os exemplos.
+    """
+    from preprocess.text import Preprocessor
+    from preprocess.cache import PreprocessCache
+    from rules.filter import compile_regex_patterns, RuleEngine
+    from semantic.encoder import SemanticEncoder
+    from semantic.backends import build_backend
+
+    nlp_cfg = settings.nlp
+    rules = RuleEngine(
+        vocab.get("keywords_explicit", []),
+        compile_regex_patterns(vocab.get("regex_patterns", {})),
+        version=vocab.get("version"),
+        fold=bool(settings.rules.get("fold_evasive", False)),
+    )
+    pre = Preprocessor(
+        nlp_cfg.get("spacy_model", "pt_core_news_sm"),
+        batch_size=int(nlp_cfg.get("batch_size", 256)),
+        n_process=int(nlp_cfg.get("n_process", 1)) if n_process is None else n_process,
+        cache=PreprocessCache(
+            max_size=int(nlp_cfg.get("cache_size", 50_000)),
+            path=nlp_cfg.get("cache_path"),
+        ),
+    )
+    enc = SemanticEncoder(
+        ENCODER_MODEL,
+        vocab.get("examples_implicit", []),
+        cache_dir=nlp_cfg.get("embedding_cache_dir"),
+        cache_capacity=int(nlp_cfg.get("embedding_cache_capacity", 200_000)),
+        examples_cache_dir=nlp_cfg.get("examples_cache_dir"),
+        vocab_version=vocab.get("version"),
+        backend=build_backend(ENCODER_MODEL, nlp_cfg),
+        index_kind=nlp_cfg.get("example_index", "exact"),
+        index_params=nlp_cfg.get("example_index_params"),
+        examples_emb=examples_emb,
+    )
+    return pre, rules, enc
+
+
+def score_options(settings) -> Dict[str, Any]:
+    """Parâmetros de score_texts vindos do settings.yaml."""
+    return {
+        "perspective_enabled": bool(settings.services.get("perspective_enabled", False)),
+        "perspective_weight": float(settings.services.get("perspective_weight", 0.4)),
+        "cascade": bool(settings.classify.get("cascade", False)),
+        "semantic_batch_size": int(settings.nlp.get("encoder_batch_size", 64)),
+        "dedup": bool(settings.classify.get("dedup", False)),
+        "dedup_threshold": float(settings.classify.get("dedup_threshold", 0.7)),
+        "dedup_min_chars": int(settings.classify.get("dedup_min_chars", 20)),
+        "perspective_options": {
+            "qps": float(settings.services.get("perspective_qps", 1.0)),
+            "concurrency": int(settings.services.get("perspective_concurrency", 8)),
+            "max_retries": int(settings.services.get("perspective_max_retries", 4)),
+            "cache_path": settings.services.get("perspective_cache_path"),
+            "cache_base_path": settings.services.get("perspective_cache_base_path"),
+            "cache_ttl_days": float(settings.services.get("perspective_cache_ttl_days", 30)),
+            "cache_max_entries": int(settings.services.get("perspective_cache_max_entries", 200_000)),
+        },
+    }
+
+
+@dataclass
+class ScoredComment:
+    preprocessed: str
+    rule_hits: List[str]
+    semantic_score: Optional[float]  # None: pulado pela cascata
+    perspective_sexual: Optional[float]
+    final_score: float
+    classification: str
+    skipped: List[str] = field(default_factory=list)  # sinais pulados pela cascata
+    semantic_example: Optional[int] = None  # índice do exemplo mais próximo em examples_implicit
+    duplicate_of: Optional[int] = None  # índice (no lote) do representante cujo score foi herdado
+    cluster: Optional[int] = None  # índice (no lote) do representante do cluster de quase-duplicatas
+    cluster_size: int = 1
+
+
+@dataclass
+class CascadeStats:
+    semantic_calls: int = 0
+    semantic_saved: int = 0
+    perspective_calls: int = 0
+    perspective_saved: int = 0
+    duplicates: int = 0  # comentários que herdaram o score do representante
+
+
+def score_texts(
+    texts: List[str],
+    pre,
+    rules,
+    enc,
+    thresholds: dict,
+    perspective_enabled: bool = False,
+    perspective_weight: float = 0.4,
+    cascade: bool = False,
+    stats: Optional[CascadeStats] = None,
+    semantic_batch_size: int = 64,
+    dedup: bool = False,
+    dedup_threshold: float = 0.7,
+    dedup_min_chars: int = 20,
+    perspective_options: Optional[Dict[str, Any]] = None,
+    perspective_stats=None,
+) -> List[ScoredComment]:
+    """
+    Pontua um lote de textos. Com cascade=True, o encoder semântico e a
+    Perspective só são chamados para comentários cujo label ainda pode mudar
+    com aquele sinal (ver aggregator.decided_label); o sinal pulado fica
+    como None (não calculado), e o label é o mesmo da pontuação completa
+    (conferido por tools/parity_cascade.py).
+
+    Com dedup=True, quase-duplicatas (preprocess/dedup.py) são agrupadas antes:
+    só o representante de cada cluster passa pelos estágios semântico/Perspective e
+    os demais herdam o resultado. Todos os textos são pré-processados (o cache torna
+    isso barato) e cada membro é conferido contra as regras com o próprio texto
+    pré-processado, que fica no seu registro; se der hits diferentes dos do
+    representante, o membro é pontuado por conta própria.
+    """
+    stats = stats if stats is not None else CascadeStats()
+    kwargs = dict(
+        perspective_enabled=perspective_enabled,
+        perspective_weight=perspective_weight,
+        cascade=cascade,
+        stats=stats,
+        semantic_batch_size=semantic_batch_size,
+        perspective_options=perspective_options,
+        perspective_stats=perspective_stats,
+    )
+    if not dedup:
+        return _score_all(texts, pre, rules, enc, thresholds, **kwargs)
+
+    from preprocess.dedup import cluster_texts
+
+    reps = cluster_texts(texts, threshold=dedup_threshold, min_chars=dedup_min_chars)
+    preprocessed_all = pre.preprocess_batch(texts)
+    results: List[Optional[ScoredComment]] = [None] * len(texts)
+    for _ in range(2):
+        # 1ª passada: representantes; 2ª: membros cujas regras divergiram do representante
+        todo = [i for i in range(len(texts)) if reps[i] == i and results[i] is None]
+        scored_todo = _score_all(
+            [texts[i] for i in todo], pre, rules, enc, thresholds,
+            preprocessed_all=[preprocessed_all[i] for i in todo], **kwargs,
+        )
+        for i, scored in zip(todo, scored_todo):
+            results[i] = scored
+        for i, rep in enumerate(reps):
+            if rep == i or results[i] is not None:
+                continue
+            base = results[rep]
+            if rules.match(texts[i], preprocessed_all[i]) == base.rule_hits:
+                results[i] = replace(base, preprocessed=preprocessed_all[i], duplicate_of=rep)
+                stats.duplicates += 1
+            else:
+                reps[i] = i
+
+    sizes = Counter(reps)
+    for i, rep in enumerate(reps):
+        if sizes[rep] > 1:
+            results[i].cluster = rep
+            results[i].cluster_size = sizes[rep]
+    return results
+
+
+def _score_all(
+    texts: List[str],
+    pre,
+    rules,
+    enc,
+    thresholds: dict,
+    perspective_enabled: bool,
+    perspective_weight: float,
+    cascade: bool,
+    stats: CascadeStats,
+    semantic_batch_size: int,
+    perspective_options: Optional[Dict[str, Any]],
+    perspective_stats,
+    preprocessed_all: Optional[List[str]] = None,
+) -> List[ScoredComment]:
+
+    if preprocessed_all is None:
+        preprocessed_all = pre.preprocess_batch(texts)
+    hits_all = [rules.match(t, p) for t, p in zip(texts, preprocessed_all)]
+
+    # ---- Semântico
+    sem_all: List[Optional[float]] = [None] * len(texts)
+    skipped_all: List[List[str]] = [[] for _ in texts]
+    pending: List[int] = []
+    for i, hits in enumerate(hits_all):
+        if cascade and decided_label(
+            hits,
+            thresholds,
+            perspective_pending=perspective_enabled,
+            perspective_weight=perspective_weight,
+        ):
+            skipped_all[i].append("semantic")
+            stats.semantic_saved += 1
+            if perspective_enabled:
+                skipped_all[i].append("perspective")
+                stats.perspective_saved += 1
+            continue
+        pending.append(i)
+
+    # Um único encode em lote para todos os comentários que ainda precisam do sinal
+    example_all: List[Optional[int]] = [None] * len(texts)
+    pending_matches = enc.match_batch(
+        [preprocessed_all[i] for i in pending], batch_size=semantic_batch_size
+    )
+    for i, (sem, example_id) in zip(pending, pending_matches):
+        sem_all[i] = sem
+        example_all[i] = example_id
+    stats.semantic_calls += len(pending)
+
+    # ---- Perspective (API paga): um lote só, com concorrência/QPS do cliente assíncrono
+    persp_all: List[Optional[float]] = [None] * len(texts)
+    if perspective_enabled:
+        to_send: List[int] = []
+        for i, hits in enumerate(hits_all):
+            if "perspective" in skipped_all[i]:
+                continue
+            if cascade and decided_label(
+                hits,
+                thresholds,
+                semantic_score=sem_all[i],
+                perspective_pending=True,
+                perspective_weight=perspective_weight,
+            ):
+                skipped_all[i].append("perspective")
+                stats.perspective_saved += 1
+                continue
+            to_send.append(i)
+        scores = get_sexually_explicit_scores(
+            [texts[i] for i in to_send],
+            stats=perspective_stats,
+            **(perspective_options or {}),
+        )
+        for i, score in zip(to_send, scores):
+            persp_all[i] = score
+        stats.perspective_calls += len(to_send)
+
+    results: List[ScoredComment] = []
+    for i in range(len(texts)):
+        # sinal pulado não pode contar como similaridade (nem com similarity <= 0)
+        sem = float("-inf") if "semantic" in skipped_all[i] else sem_all[i]
+        final_score, label = aggregate_risk(
+            rule_hits=hits_all[i],
+            semantic_score=sem,
+            thresholds=thresholds,
+            perspective_sexual=persp_all[i],
+            perspective_weight=perspective_weight,
+        )
+        results.append(ScoredComment(
+            preprocessed=preprocessed_all[i],
+            rule_hits=hits_all[i],
+            semantic_score=sem_all[i],
+            perspective_sexual=persp_all[i],
+            final_score=final_score,
+            classification=label,
+            skipped=skipped_all[i],
+            semantic_example=example_all[i],
+        ))
+    return results
@@ -0,0 +1,112 @@
+"""
+src/classify/vocab_watcher.py
+Recarga do vocabulário a quente para processos de longa duração.
+
+VocabWatcher consulta a Vocab API a cada `interval` segundos (GET condicional, ver
+vocab_client). Quando o vocabulário muda, monta em uma thread de fundo um novo
+VocabSnapshot — RuleEngine recompilado e SemanticEncoder.with_examples (só os exemplos
+novos são codificados; modelo e caches são compartilhados) — e troca a referência de uma
+vez. Quem pontua pega snapshot() uma vez por lote: o lote inteiro usa o mesmo vocabulário,
+mesmo que a troca aconteça no meio dele.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from rules.filter import compile_regex_patterns, RuleEngine
+
+logger = logging.getLogger("classify.vocab_watcher")
+
+
+@dataclass(frozen=True)
+class VocabSnapshot:
+    vocab: Dict[str, Any]
+    rules: Any   # RuleEngine
+    enc: Any     # SemanticEncoder
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.vocab.get("version")
+
+    @property
+    def examples(self):
+        return self.vocab.get("examples_implicit", [])
+
+
+class VocabWatcher:
+    def __init__(
+        self,
+        vocab: Dict[str, Any],
+        rules,
+        enc,
+        fold: bool = False,
+        interval: float = 60.0,
+        fetch: Optional[Callable[[], Dict[str, Any]]] = None,
+        on_swap: Optional[Callable[[VocabSnapshot], None]] = None,
+    ):
+        self.fold = fold
+        self.interval = interval
+        self.on_swap = on_swap
+        if fetch is None:
+            from services.vocab_client import fetch_vocab
+
+            fetch = lambda: fetch_vocab(max_age=0)  # sempre revalida (304 se nada mudou)
+        self.fetch = fetch
+        self._snapshot = VocabSnapshot(vocab, rules, enc)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def snapshot(self) -> VocabSnapshot:
+        return self._snapshot
+
+    def build(self, vocab: Dict[str, Any]) -> VocabSnapshot:
+        current = self._snapshot
+        rules = RuleEngine(
+            vocab.get("keywords_explicit", []),
+            compile_regex_patterns(vocab.get("regex_patterns", {})),
+            version=vocab.get("version"),
+            fold=self.fold,
+        )
+        enc = current.enc.with_examples(vocab.get("examples_implicit", []), vocab_version=vocab.get("version"))
+        return VocabSnapshot(vocab, rules, enc)
+
+    def check(self) -> bool:
+        """Uma consulta; True se o vocabulário mudou e o snapshot foi trocado."""
+        try:
+            vocab = self.fetch()
+        except Exception as e:
+            logger.warning("[VocabWatcher] falha ao consultar a Vocab API: %s", e)
+            return False
+        current = self._snapshot
+        if vocab == current.vocab:
+            return False
+
+        snap = self.build(vocab)
+        self._snapshot = snap  # troca atômica da referência
+        logger.info(
+            "[VocabWatcher] vocab %s -> %s (KW=%d | EX=%d | Regex=%d)",
+            current.version, snap.version,
+            len(vocab.get("keywords_explicit", [])), len(snap.examples), len(vocab.get("regex_patterns", {})),
+        )
+        if self.on_swap is not None:
+            self.on_swap(snap)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("[VocabWatcher] falha ao montar o novo vocabulário; mantendo o atual")
+
+    def start(self) -> "VocabWatcher":
+        self._thread = threading.Thread(target=self._run, name="vocab-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
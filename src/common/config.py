@@ -2,7 +2,7 @@
 src/common/config.py
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict
 from pathlib import Path
 import os
@@ -19,6 +19,8 @@ class Settings:
     thresholds: Dict[str, float]
     services: Dict[str, Any]
     storage: Dict[str, Any]
+    rules: Dict[str, Any] = field(default_factory=dict)
+    classify: Dict[str, Any] = field(default_factory=dict)
 
 def load_settings() -> Settings:
     """
@@ -33,6 +35,8 @@ def load_settings() -> Settings:
         thresholds=raw.get("thresholds", {}),
         services=raw.get("services", {}),
         storage=raw.get("storage", {}),
+        rules=raw.get("rules", {}),
+        classify=raw.get("classify", {}),
     )
 
 def get_env(key: str, default: str | None = None) -> str | None:
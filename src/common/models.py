@@ -15,11 +15,12 @@ class CommentRecord:
     text: str                          
     preprocessed: str                   
     rule_hits: List[str]               
-    semantic_score: float               
+    semantic_score: Optional[float]     # None: pulado pela cascata
     perspective_sexual: Optional[float] 
     final_score: float                  
     classification: str                
     extras: Dict[str, Any]              
+    vocab_version: Optional[str] = None  # versão do vocabulário usada na pontuação
 
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dict (útil para persistir)."""
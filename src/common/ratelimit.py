@@ -0,0 +1,44 @@
+"""
+src/common/ratelimit.py
+Limite de taxa compartilhado entre threads (coletas concorrentes de YouTube/Reddit).
+- RateLimiter: token bucket (qps, burst); acquire() bloqueia até haver ficha.
+- budget opcional: total de unidades de cota da execução; esgotado, acquire() devolve False
+  e quem coleta deve parar (ex.: cota diária da YouTube Data API).
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    def __init__(self, qps: float, burst: Optional[float] = None, budget: Optional[int] = None):
+        self.qps = float(qps)
+        self.capacity = float(burst or max(1.0, self.qps))
+        self.budget = budget
+        self.used = 0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        return self.budget is not None and self.used >= self.budget
+
+    def acquire(self, cost: int = 1) -> bool:
+        """Espera uma ficha e debita `cost` unidades do orçamento; False se o orçamento acabou."""
+        with self._lock:
+            if self.budget is not None and self.used + cost > self.budget:
+                return False
+            self.used += cost
+            if self.qps <= 0:
+                return True
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.qps)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.qps if self._tokens < 0 else 0.0
+        # Reserva feita sob o lock; a espera fica fora dele para não serializar as threads
+        if wait > 0:
+            time.sleep(wait)
+        return True
@@ -22,7 +22,7 @@ def to_row(rec) -> dict:
         "text": (rec.text or "").replace("\n", " ").strip(),
         "preprocessed": rec.preprocessed,
         "rule_hits": "|".join(rec.rule_hits),
-        "semantic_score": rec.semantic_score,
+        "semantic_score": rec.semantic_score if rec.semantic_score is not None else "",
         "perspective_sexual": rec.perspective_sexual if rec.perspective_sexual is not None else "",
         "final_score": rec.final_score,
         "classification": rec.classification,
@@ -66,7 +66,8 @@ def main():
         text_preview = (r.text or "").replace("\n", " ")
         if len(text_preview) > 160:
             text_preview = text_preview[:160] + "..."
-        print(f"{i:02d}) score={r.final_score:.2f}  sem={r.semantic_score:.2f}  hits={hits}")
+        sem = f"{r.semantic_score:.2f}" if r.semantic_score is not None else "-"
+        print(f"{i:02d}) score={r.final_score:.2f}  sem={sem}  hits={hits}")
         print(f"    author={r.author or '-'} | {text_preview}")
 
 if __name__ == "__main__":
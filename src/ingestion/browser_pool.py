@@ -0,0 +1,175 @@
+"""
+src/ingestion/browser_pool.py
+Pool de sessões Selenium (Chrome headless) quentes, compartilhado pelas requisições da scraper API.
+- o chromedriver é resolvido uma vez por processo (ChromeDriverManager().install() em cache);
+- cada sessão é reusada até max_uses requisições, conferida (health check) antes de cada uso e
+  descartada se der erro no meio de uma raspagem;
+- sessões paradas há mais de idle_timeout segundos são encerradas por uma thread de limpeza;
+- Session.state guarda o que a sessão já tem (ex.: login do Instagram), para não refazer.
+Configuração por ambiente: BROWSER_POOL_SIZE, BROWSER_MAX_USES, BROWSER_IDLE_TIMEOUT.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+logger = logging.getLogger("ingestion.browser_pool")
+
+POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))
+IDLE_TIMEOUT = float(os.getenv("BROWSER_IDLE_TIMEOUT", "300"))
+
+
+@lru_cache(maxsize=1)
+def _driver_path() -> str:
+    # Baixa/confere o chromedriver uma vez só (antes era a cada requisição)
+    return ChromeDriverManager().install()
+
+
+def build_driver():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(service=Service(_driver_path()), options=options)
+
+
+@dataclass
+class Session:
+    driver: Any
+    uses: int = 0
+    created: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    state: Dict[str, Any] = field(default_factory=dict)
+
+
+def _quit(session: Session):
+    try:
+        session.driver.quit()
+    except Exception as e:
+        logger.debug("[Browser] falha ao encerrar sessão: %s", e)
+
+
+def _healthy(session: Session) -> bool:
+    try:
+        session.driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        name: str,
+        size: int = POOL_SIZE,
+        max_uses: int = MAX_USES,
+        idle_timeout: float = IDLE_TIMEOUT,
+        factory: Callable[[], Any] = build_driver,
+    ):
+        self.name = name
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self.factory = factory
+        self.created = 0  # sessões abertas desde o início (para medir o reuso)
+        self._idle: List[Session] = []  # pilha: a mais recente primeiro, as antigas envelhecem
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reaper = threading.Thread(target=self._reap, name=f"browser-pool-{name}", daemon=True)
+        self._reaper.start()
+
+    def _take(self) -> Session:
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+                if session is None:
+                    self.created += 1
+            if session is None:
+                logger.info("[Browser] %s: abrindo sessão nova (#%d)", self.name, self.created)
+                return Session(self.factory())
+            if _healthy(session):
+                return session
+            logger.info("[Browser] %s: sessão sem resposta descartada", self.name)
+            _quit(session)
+
+    def _give_back(self, session: Session, failed: bool):
+        session.uses += 1
+        session.last_used = time.monotonic()
+        if failed or session.uses >= self.max_uses or self._closed.is_set():
+            _quit(session)
+            return
+        try:
+            session.driver.get("about:blank")  # solta a página anterior (memória, timers)
+        except Exception:
+            _quit(session)
+            return
+        with self._lock:
+            self._idle.append(session)
+
+    @contextmanager
+    def session(self, timeout: float = 120.0) -> Iterator[Session]:
+        """Sessão exclusiva enquanto durar o `with`; se a raspagem falhar, ela é descartada."""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"Nenhum navegador livre no pool '{self.name}' em {timeout:.0f}s")
+        session: Optional[Session] = None
+        failed = False
+        try:
+            session = self._take()
+            yield session
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            if session is not None:
+                self._give_back(session, failed)
+            self._slots.release()
+
+    def _reap(self):
+        while not self._closed.wait(max(1.0, self.idle_timeout / 4)):
+            now = time.monotonic()
+            with self._lock:
+                stale = [s for s in self._idle if now - s.last_used > self.idle_timeout]
+                self._idle = [s for s in self._idle if s not in stale]
+            for s in stale:
+                logger.info("[Browser] %s: sessão ociosa encerrada após %d usos", self.name, s.uses)
+                _quit(s)
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for s in idle:
+            _quit(s)
+
+
+_POOLS: Dict[str, BrowserPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(name: str) -> BrowserPool:
+    """Um pool por plataforma: sessões do Instagram carregam login, as do Twitter não."""
+    with _POOLS_LOCK:
+        if name not in _POOLS:
+            _POOLS[name] = BrowserPool(name)
+        return _POOLS[name]
+
+
+@atexit.register
+def close_pools():
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,62 @@
+"""
+src/ingestion/checkpoints.py
+Checkpoints da coleta incremental: para cada (plataforma, fonte) — ex.: um vídeo do
+YouTube — o comentário mais novo já processado (id + publishedAt), em SQLite.
+A coleta em ordem cronológica reversa para de paginar ao alcançar esse ponto, então o
+monitoramento periódico só paga pelo que é novo.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+Checkpoint = Tuple[str, Optional[str]]  # (comment_id, publishedAt ISO 8601)
+
+
+class CheckpointStore:
+    def __init__(self, path: str, platform: str):
+        self.platform = platform
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "platform TEXT NOT NULL, source_id TEXT NOT NULL, comment_id TEXT NOT NULL, "
+            "published_at TEXT, updated REAL NOT NULL, PRIMARY KEY (platform, source_id))"
+        )
+        self._db.commit()
+
+    def get_many(self, source_ids: Iterable[str]) -> Dict[str, Checkpoint]:
+        found: Dict[str, Checkpoint] = {}
+        for source_id in dict.fromkeys(source_ids):
+            row = self._db.execute(
+                "SELECT comment_id, published_at FROM checkpoints WHERE platform = ? AND source_id = ?",
+                (self.platform, source_id),
+            ).fetchone()
+            if row:
+                found[source_id] = (row[0], row[1])
+        return found
+
+    def put_many(self, checkpoints: Dict[str, Checkpoint]):
+        now = time.time()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO checkpoints (platform, source_id, comment_id, published_at, updated) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(self.platform, s, cid, pub, now) for s, (cid, pub) in checkpoints.items()],
+        )
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+def newest_by_source(comments: Iterable[Dict]) -> Dict[str, Checkpoint]:
+    """Comentário de topo mais novo (maior publishedAt) de cada source_id; respostas são ignoradas."""
+    newest: Dict[str, Checkpoint] = {}
+    for c in comments:
+        if c.get("parent_id") or not c.get("source_id"):
+            continue
+        current = newest.get(c["source_id"])
+        if current is None or (c.get("publishedAt") or "") > (current[1] or ""):
+            newest[c["source_id"]] = (c["comment_id"], c.get("publishedAt"))
+    return newest
@@ -1,25 +1,116 @@
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import tempfile
 import time
+from pathlib import Path
 from typing import List, Dict, Optional
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-def _build_driver():
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-def _login_instagram(driver, user: str, password: str):
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from .browser_pool import Session, get_pool
+
+# Cookies de sessão por credencial (usuário + senha): o login completo só acontece quando expiram
+COOKIE_DIR = Path(os.getenv("INSTAGRAM_COOKIE_DIR", "data/cache/instagram"))
+
+
+def _secret() -> bytes:
+    """Chave do HMAC das credenciais: INSTAGRAM_COOKIE_SECRET ou uma chave aleatória local (0600)."""
+    env = os.getenv("INSTAGRAM_COOKIE_SECRET")
+    if env:
+        return env.encode("utf-8")
+    path = COOKIE_DIR / ".secret"
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Grava num temporário (0600) e publica com link, que é atômico: workers subindo juntos
+    # nunca leem uma chave pela metade, e quem perde a corrida usa a chave de quem ganhou
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".secret.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(secrets.token_bytes(32))
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+    finally:
+        os.remove(tmp)
+    return path.read_bytes()
+
+
+def _credential_id(user: str, password: str) -> str:
+    # Sessão/cookies só são reaproveitados para quem traz exatamente as mesmas credenciais;
+    # com a chave, o nome do arquivo também não serve para testar senhas offline
+    msg = user.encode("utf-8") + b"\0" + password.encode("utf-8")
+    return hmac.new(_secret(), msg, hashlib.sha256).hexdigest()
+
+
+def _cookie_path(credential: str) -> Path:
+    return COOKIE_DIR / f"{credential[:32]}.json"
+
+
+def _login_instagram(driver, user: str, password: str, timeout: float = 20.0):
     driver.get("https://www.instagram.com/accounts/login/")
-    time.sleep(2)
+    wait = WebDriverWait(driver, timeout)
+    wait.until(lambda d: d.find_elements(By.NAME, "username"))
     driver.find_elements(By.NAME, "username")[0].send_keys(user)
     driver.find_elements(By.NAME, "password")[0].send_keys(password)
     driver.find_elements(By.XPATH, "//button[@type='submit']")[0].click()
-    time.sleep(5)
+    # Logado = cookie sessionid emitido (em vez de esperar um tempo fixo)
+    wait.until(lambda d: d.get_cookie("sessionid"))
+
+
+def _restore_cookies(driver, credential: str) -> bool:
+    """Aplica os cookies salvos da credencial; True se a sessão ainda vale (não caiu no login)."""
+    try:
+        cookies = json.loads(_cookie_path(credential).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    driver.get("https://www.instagram.com/")  # add_cookie exige estar no domínio
+    driver.delete_all_cookies()
+    for c in cookies:
+        if c.get("sameSite") not in ("Strict", "Lax", "None"):
+            c.pop("sameSite", None)
+        if "expiry" in c:
+            c["expiry"] = int(c["expiry"])  # add_cookie recusa float
+        driver.add_cookie(c)
+    driver.get("https://www.instagram.com/")
+    return bool(driver.get_cookie("sessionid")) and "accounts/login" not in driver.current_url
+
+
+def _save_cookies(driver, credential: str):
+    path = _cookie_path(credential)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(driver.get_cookies()), encoding="utf-8")
+    os.chmod(tmp, 0o600)  # credencial: só o dono do processo lê
+    os.replace(tmp, path)
+
+
+def _ensure_login(session: Session, user: str, password: str):
+    """
+    Sessão do pool logada com estas credenciais: já logada, cookies salvos ou, por fim, login
+    completo. Credenciais diferentes das que logaram a sessão (mesmo usuário, outra senha) não
+    herdam nada: os cookies são apagados e o login é refeito — e falha se a senha estiver errada.
+    """
+    credential = _credential_id(user, password)
+    if session.state.get("instagram_login") == credential:
+        return
+    driver = session.driver
+    session.state.pop("instagram_login", None)
+    if not _restore_cookies(driver, credential):
+        driver.delete_all_cookies()
+        try:
+            _login_instagram(driver, user, password)
+        except TimeoutException:
+            raise RuntimeError("Login no Instagram não concluído (credenciais ou verificação extra?)")
+        _save_cookies(driver, credential)
+    session.state["instagram_login"] = credential
 
 def _collect_comments(driver, limit: int) -> List[Dict]:
     data: List[Dict] = []
@@ -91,15 +182,13 @@ def _collect_comments(driver, limit: int) -> List[Dict]:
 def scrape_instagram_much(user: str, password: str, body: dict, limit: int = 10):
     reels = body.get("reels", []) or []
     posts = body.get("posts", []) or []
-    driver = _build_driver()
-    _login_instagram(driver, user, password)
-    time.sleep(5)
-
     reels_results = []
     posts_results = []
     total_items = len(reels) + len(posts)
 
-    try:
+    with get_pool("instagram").session() as session:
+        _ensure_login(session, user, password)
+        driver = session.driver
         for rid in reels:
             url = f"https://www.instagram.com/reel/{rid}"
             driver.get(url)
@@ -116,21 +205,16 @@ def scrape_instagram_much(user: str, password: str, body: dict, limit: int = 10)
             data = _collect_comments(driver, limit)
             posts_results.append({"id": pid, "data": data})
 
-    finally:
-        driver.quit()
-        print(f"🧹 Sessão encerrada após {total_items} itens.")
+        print(f"🧹 Sessão devolvida ao pool após {total_items} itens.")
 
     return {"summary": {"total": total_items, "success": len(reels_results + posts_results)}, "reels": reels_results, "posts": posts_results}
 
 def scrape_instagram_one(user: str, password: str, mode: str, id: str, limit: int = 10) -> List[Dict]:
-    try:
-        driver = _build_driver()
-        _login_instagram(driver, user, password)
+    with get_pool("instagram").session() as session:
+        _ensure_login(session, user, password)
         if mode == "reel":
             url = f"https://www.instagram.com/reel/{id}"
         else:
             url = f"https://www.instagram.com/p/{id}"
-        driver.get(url)
-        return _collect_comments(driver, limit)
-    finally:
-        driver.quit()
\ No newline at end of file
+        session.driver.get(url)
+        return _collect_comments(session.driver, limit)
\ No newline at end of file
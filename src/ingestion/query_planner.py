@@ -0,0 +1,96 @@
+"""
+src/ingestion/query_planner.py
+Planejamento das buscas do --reddit-search-auto pelo rendimento observado em execuções anteriores.
+Cada par (subreddit, query) é um "braço" de um bandit UCB1 com estatísticas em JSON:
+- calls: chamadas à API gastas (1 busca + 1 coleta por post novo), flagged: comentários suspeito/atenção;
+- plan(): parte do orçamento vai para pares nunca tentados (exploração de termos novos do
+  vocabulário), o resto para o maior flagged/call + bônus de incerteza (UCB1);
+- record(): a cada execução as estatísticas antigas decaem (decay), então termos que pararam
+  de render perdem prioridade e termos esquecidos voltam a ser testados.
+"""
+
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Arm = Tuple[str, str]  # (query, subreddit)
+
+
+class QueryPlanner:
+    def __init__(self, path: Optional[str], exploration: float = 1.0, explore_share: float = 0.25,
+                 decay: float = 0.9):
+        self.path = Path(path) if path else None
+        self.exploration = exploration
+        self.explore_share = explore_share
+        self.decay = decay
+        self.arms: Dict[str, Dict[str, Dict[str, float]]] = {}  # subreddit -> query -> stats
+        if self.path and self.path.exists():
+            try:
+                self.arms = json.loads(self.path.read_text(encoding="utf-8")).get("arms", {})
+            except (OSError, ValueError):
+                self.arms = {}
+
+    def stats(self, query: str, subreddit: str) -> Optional[Dict[str, float]]:
+        return self.arms.get(subreddit, {}).get(query)
+
+    def _scores(self, tried: List[Arm]) -> Dict[Arm, float]:
+        means = {a: self.stats(*a)["flagged"] / max(self.stats(*a)["calls"], 1e-9) for a in tried}
+        total = sum(self.stats(*a)["calls"] for a in tried)
+        # Bônus na escala dos rendimentos observados (flagged/call não é limitado a [0, 1])
+        scale = max(max(means.values(), default=0.0), 0.1)
+        return {
+            a: means[a] + self.exploration * scale * math.sqrt(
+                math.log(max(total, 2.0)) / max(self.stats(*a)["calls"], 1e-9))
+            for a in tried
+        }
+
+    def plan(self, queries: Iterable[str], subreddits: Iterable[str], budget: int) -> List[Arm]:
+        """Até `budget` pares (query, subreddit), os mais promissores primeiro."""
+        arms = [(q, s) for q in dict.fromkeys(queries) for s in dict.fromkeys(subreddits)]
+        if budget <= 0:
+            return []
+        tried = [a for a in arms if self.stats(*a) and self.stats(*a)["calls"] > 0]
+        known = set(tried)
+        fresh = [a for a in arms if a not in known]  # ordem do vocabulário
+
+        n_fresh = min(len(fresh), max(1, int(round(budget * self.explore_share))))
+        scores = self._scores(tried)
+        ranked = sorted(tried, key=lambda a: scores[a], reverse=True)
+        picked = ranked[:budget - n_fresh]
+        # Poucos pares conhecidos: o que sobra do orçamento também vai para termos novos
+        picked += fresh[:budget - len(picked)]
+        # Novos primeiro (score infinito): o max_total pode cortar o fim da fila antes de tentá-los
+        return sorted(picked, key=lambda a: scores.get(a, math.inf), reverse=True)
+
+    def record(self, usage: Dict[Arm, Dict[str, int]], flagged: Dict[Arm, int]):
+        """
+        Soma o que cada par gastou (usage: calls/posts) e rendeu (flagged) nesta execução.
+        Pares com usage["truncated"] (cortados pelo max_total) ficam de fora: o gasto deles
+        não veio acompanhado de todos os comentários que teriam rendido.
+        """
+        for queries in self.arms.values():
+            for st in queries.values():
+                for k in ("calls", "posts", "flagged"):
+                    st[k] = st.get(k, 0.0) * self.decay
+        now = time.time()
+        for (query, subreddit), used in usage.items():
+            if used.get("truncated"):
+                continue
+            st = self.arms.setdefault(subreddit, {}).setdefault(
+                query, {"calls": 0.0, "posts": 0.0, "flagged": 0.0, "runs": 0})
+            st["calls"] += used.get("calls", 0)
+            st["posts"] += used.get("posts", 0)
+            st["flagged"] += flagged.get((query, subreddit), 0)
+            st["runs"] = st.get("runs", 0) + 1
+            st["updated"] = now
+
+    def save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"arms": self.arms}, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -1,19 +1,51 @@
 # src/ingestion/reddit.py
 from datetime import datetime
-from typing import List, Dict
-import praw
-import pandas as pd
+from typing import List, Dict, TYPE_CHECKING
 
 from .reddit_client import get_client
 
+if TYPE_CHECKING:
+    import pandas as pd
+    import praw
+
+
+def comment_to_row(c: "praw.models.Comment", submission_id: str) -> Dict:
+    """praw Comment -> dict no formato usado pelo pipeline."""
+    author = str(c.author) if c.author else "[deleted]"
+    return {
+        "comment_id": f"{submission_id}:{c.id}",
+        "platform": "reddit",
+        "source_id": submission_id,
+        "author": author,
+        "text": c.body or "",
+        "likeCount": getattr(c, "score", 0),
+        "publishedAt": datetime.utcfromtimestamp(c.created_utc).isoformat() + "Z",
+        "permalink": f"https://www.reddit.com{c.permalink}",
+    }
+
 
 def fetch_submission_comments(
     submission_id: str,
     limit: int = 200,
     sort: str = "new",
     only_root: bool = False,
+    reddit=None,
+    mode: str = "praw",
+    more_budget: int = 10,
+    limiter=None,
 ) -> List[Dict]:
-    reddit = get_client()
+    if mode == "raw":
+        # JSON cru + morechildren limitado (ver reddit_raw.py); limiter vale por requisição
+        from .reddit_raw import fetch_submission_comments_raw
+
+        return fetch_submission_comments_raw(
+            submission_id, limit=limit, sort=sort, only_root=only_root, more_budget=more_budget,
+            limiter=limiter,
+        )
+
+    import praw  # import pesado: só no modo PRAW
+
+    reddit = reddit or get_client()
     sub = reddit.submission(id=submission_id)
 
     # sort aceitos pelo Reddit
@@ -33,17 +65,7 @@ def fetch_submission_comments(
         if only_root and not c.is_root:
             continue
 
-        author = str(c.author) if c.author else "[deleted]"
-        out.append({
-            "comment_id": f"{sub.id}:{c.id}",
-            "platform": "reddit",
-            "source_id": sub.id,
-            "author": author,
-            "text": c.body or "",
-            "likeCount": getattr(c, "score", 0),
-            "publishedAt": datetime.utcfromtimestamp(c.created_utc).isoformat() + "Z",
-            "permalink": f"https://www.reddit.com{c.permalink}",
-        })
+        out.append(comment_to_row(c, sub.id))
 
         count += 1
         if limit and count >= limit:
@@ -63,10 +85,12 @@ def _extract_submission_id(url_or_id: str) -> str:
     return url_or_id  # já é o ID puro
 
 
-def get_reddit_comments(url_or_id: str, limit: int = 100) -> pd.DataFrame:
+def get_reddit_comments(url_or_id: str, limit: int = 100) -> "pd.DataFrame":
     """
     Busca e retorna comentários do Reddit em um DataFrame.
     """
+    import pandas as pd
+
     submission_id = _extract_submission_id(url_or_id)
     raw_comments = fetch_submission_comments(submission_id=submission_id, limit=limit)
     return pd.DataFrame(raw_comments)
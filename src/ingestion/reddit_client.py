@@ -1,10 +1,33 @@
 # src/ingestion/reddit_client.py
+import os
+import threading
 from functools import lru_cache
-import praw
-from src.common.config import get_env
+from typing import TYPE_CHECKING
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    import praw
+
+# Mesmo esquema do youtube.py: funciona importado como ingestion.* (main) ou src.ingestion.* (API)
+load_dotenv()
+get_env = os.getenv
+
+_local = threading.local()
 
 @lru_cache(maxsize=1)
-def get_client() -> praw.Reddit:
+def get_client() -> "praw.Reddit":
+    return _new_client()
+
+def get_thread_client() -> "praw.Reddit":
+    """Um praw.Reddit por thread (a instância não é thread-safe) para coletas em paralelo."""
+    reddit = getattr(_local, "reddit", None)
+    if reddit is None:
+        reddit = _local.reddit = _new_client()
+    return reddit
+
+def _new_client() -> "praw.Reddit":
+    import praw  # import pesado: só quando um cliente é criado
+
     client_id = get_env("REDDIT_CLIENT_ID")
     client_secret = get_env("REDDIT_CLIENT_SECRET")
     user_agent = get_env("REDDIT_USER_AGENT") or "AlertaSegurancaOnline/0.1 by u/unknown"
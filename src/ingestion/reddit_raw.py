@@ -0,0 +1,174 @@
+# src/ingestion/reddit_raw.py
+"""
+Coleta de comentários do Reddit direto do JSON da API, sem materializar objetos PRAW.
+- RawRedditClient: token app-only (client_credentials) renovado sozinho e uma requests.Session
+  com pool de conexões, compartilhada entre threads.
+- fetch_submission_comments_raw: percorre a árvore de /comments/<id> em largura (mesma ordem
+  do comments.list() do PRAW), sem recursão, direto no formato de dict de reddit.fetch_submission_comments.
+  Os nós "more" são expandidos com /api/morechildren até more_budget chamadas (o caminho PRAW
+  usa replace_more(limit=0) e os descarta).
+Comparar com o caminho PRAW: python -m tools.bench_reddit_fetch
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger("ingestion.reddit_raw")
+
+REDDIT_URL = "https://www.reddit.com"
+OAUTH_URL = "https://oauth.reddit.com"
+
+
+class RawRedditClient:
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        user_agent: str,
+        reddit_url: str = REDDIT_URL,
+        oauth_url: str = OAUTH_URL,
+        pool_size: int = 8,
+        timeout: float = 15.0,
+        limiter=None,
+    ):
+        self.auth = (client_id, client_secret)
+        self.reddit_url = reddit_url.rstrip("/")
+        self.oauth_url = oauth_url.rstrip("/")
+        self.timeout = timeout
+        self.limiter = limiter
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._token: Optional[str] = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def _bearer(self, force: bool = False) -> str:
+        with self._lock:
+            if force or self._token is None or time.time() > self._expires - 60:
+                r = self.session.post(
+                    f"{self.reddit_url}/api/v1/access_token",
+                    auth=self.auth,
+                    data={"grant_type": "client_credentials"},
+                    timeout=self.timeout,
+                )
+                r.raise_for_status()
+                data = r.json()
+                self._token = data["access_token"]
+                self._expires = time.time() + float(data.get("expires_in", 3600))
+            return self._token
+
+    def get(self, path: str, params: Optional[Dict] = None, limiter=None):
+        """limiter da chamada (ou, sem ele, o do cliente): o cliente é compartilhado pelo processo."""
+        params = dict(params or {}, raw_json=1)  # sem &amp; etc. no corpo dos comentários
+        limiter = limiter if limiter is not None else self.limiter
+        for attempt in range(2):
+            if limiter is not None:
+                limiter.acquire()
+            r = self.session.get(
+                f"{self.oauth_url}{path}",
+                params=params,
+                headers={"Authorization": f"bearer {self._bearer(force=attempt > 0)}"},
+                timeout=self.timeout,
+            )
+            if r.status_code != 401:
+                break
+        r.raise_for_status()
+        return r.json()
+
+
+@lru_cache(maxsize=1)
+def get_raw_client() -> RawRedditClient:
+    client_id = os.getenv("REDDIT_CLIENT_ID")
+    client_secret = os.getenv("REDDIT_CLIENT_SECRET")
+    user_agent = os.getenv("REDDIT_USER_AGENT") or "AlertaSegurancaOnline/0.1 by u/unknown"
+    if not (client_id and client_secret):
+        raise SystemExit("Defina REDDIT_CLIENT_ID e REDDIT_CLIENT_SECRET no .env")
+    return RawRedditClient(client_id, client_secret, user_agent)
+
+
+def _row(submission_id: str, c: Dict) -> Dict:
+    return {
+        "comment_id": f"{submission_id}:{c['id']}",
+        "platform": "reddit",
+        "source_id": submission_id,
+        "author": c.get("author") or "[deleted]",
+        "text": c.get("body") or "",
+        "likeCount": c.get("score", 0),
+        "publishedAt": datetime.utcfromtimestamp(c.get("created_utc", 0)).isoformat() + "Z",
+        "permalink": f"https://www.reddit.com{c.get('permalink', '')}",
+    }
+
+
+def fetch_submission_comments_raw(
+    submission_id: str,
+    limit: int = 200,
+    sort: str = "new",
+    only_root: bool = False,
+    more_budget: int = 10,
+    client: Optional[RawRedditClient] = None,
+    limiter=None,
+) -> List[Dict]:
+    client = client or get_raw_client()
+    params = {"limit": 500}
+    if sort in {"new", "top", "best", "controversial", "old", "qa"}:
+        params["sort"] = sort
+    if only_root:
+        params["depth"] = 1
+    _, listing = client.get(f"/comments/{submission_id}", params, limiter=limiter)
+
+    out: List[Dict] = []
+    nodes = deque(listing["data"]["children"])
+    more_ids: deque = deque()
+    calls = 0
+    while nodes or (more_ids and calls < more_budget):
+        if not nodes:
+            # Próximo lote de ids ocultos ("load more comments"), até 100 por chamada
+            batch = [more_ids.popleft() for _ in range(min(100, len(more_ids)))]
+            data = client.get("/api/morechildren", {
+                "api_type": "json",
+                "link_id": f"t3_{submission_id}",
+                "children": ",".join(batch),
+                "sort": params.get("sort", "confidence"),
+            }, limiter=limiter)
+            calls += 1
+            # things vem achatado (filhos listados separadamente, com parent_id)
+            nodes.extend(data.get("json", {}).get("data", {}).get("things", []))
+            continue
+
+        node = nodes.popleft()
+        kind, data = node.get("kind"), node.get("data", {})
+        if kind == "more":
+            # "continue this thread" (id "_", sem children) exigiria outra listagem: fica de fora
+            if not only_root or data.get("parent_id", "").startswith("t3_"):
+                more_ids.extend(data.get("children", []))
+            continue
+        if kind != "t1":
+            continue
+        if only_root and not data.get("parent_id", "").startswith("t3_"):
+            continue
+
+        out.append(_row(submission_id, data))
+        if limit and len(out) >= limit:
+            break
+        replies = data.get("replies")
+        if replies and not only_root:
+            nodes.extend(replies["data"]["children"])
+
+    if more_ids and calls >= more_budget:
+        logger.debug("[Reddit] %s: %d comentários ocultos além do orçamento de morechildren",
+                     submission_id, len(more_ids))
+    return out
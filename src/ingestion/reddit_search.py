@@ -1,55 +1,173 @@
 # src/ingestion/reddit_search.py
-from typing import List, Dict, Iterable, Set
-from .reddit_client import get_client
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Dict, Iterable, Iterator, Optional, Set, Tuple
+from .reddit_client import get_client, get_thread_client
 from .reddit import fetch_submission_comments
 
-def search_and_collect_comments(
+logger = logging.getLogger("ingestion.reddit_search")
+
+def iter_search_comments(
     queries: List[str],
     subreddits: List[str],
     limit_per_query: int = 15,
-    time_filter: str = "week",       
-    sort: str = "new",               
+    time_filter: str = "week",
+    sort: str = "new",
     per_submission_limit: int = 80,
     max_total: int = 300,
-) -> List[Dict]:
-
+    workers: int = 4,
+    limiter=None,
+    fetch_mode: str = "praw",
+    more_budget: int = 10,
+    pairs: Optional[List[Tuple[str, str]]] = None,
+    usage: Optional[Dict[Tuple[str, str], Dict[str, int]]] = None,
+) -> Iterator[Dict]:
+    """
+    Busca posts por query/subreddit e coleta os comentários de cada post novo em um pool
+    de `workers` threads (um cliente PRAW por thread). As buscas e as coletas passam pelo
+    mesmo limiter (common.ratelimit.RateLimiter), respeitando o limite da API do Reddit.
+    Os comentários saem em stream, na ordem em que os posts terminam, até max_total.
+    seen_submissions continua global: cada post é coletado uma vez só.
+    fetch_mode="raw" coleta pelo JSON cru (reddit_raw.py) em vez de objetos PRAW.
+    pairs: lista explícita de (query, subreddit) no lugar de queries x subreddits (query_planner.py);
+    cada comentário sai com search_query/search_subreddit da busca que achou o post, e usage
+    recebe as chamadas e posts coletados de cada par (contados quando a coleta de fato roda).
+    Pares cortados pelo max_total (busca interrompida, coleta cancelada ou comentários
+    descartados) saem com usage[par]["truncated"] = 1: o rendimento deles ficou incompleto.
+    """
     reddit = get_client()
-    total: List[Dict] = []
     seen_submissions: Set[str] = set()
 
     def _iter_subs() -> Iterable[str]:
         return subreddits or ["all"]
 
-    for q in queries:
-        if len(total) >= max_total:
-            break
+    def _acquire() -> bool:
+        return limiter is None or limiter.acquire()
 
-        for s in _iter_subs():
-            if len(total) >= max_total:
-                break
+    def _pairs() -> Iterable[Tuple[str, str]]:
+        if pairs is not None:
+            return pairs
+        return [(q, s) for q in queries for s in _iter_subs()]
 
+    usage_lock = threading.Lock()
+
+    def _use(arm: Tuple[str, str], key: str):
+        # Chamado também pelas threads do pool
+        if usage is not None:
+            with usage_lock:
+                counts = usage.setdefault(arm, {"calls": 0, "posts": 0})
+                counts[key] = counts.get(key, 0) + 1
+
+    def _submission_ids() -> Iterator[Tuple[str, Tuple[str, str]]]:
+        for q, s in _pairs():
+            if not _acquire():
+                return
+            _use((q, s), "calls")
             sr = reddit.subreddit(s)
-            submissions = sr.search(
-                q, sort=sort, time_filter=time_filter, limit=limit_per_query
-            )
+            for sub in sr.search(q, sort=sort, time_filter=time_filter, limit=limit_per_query):
+                yield sub.id, (q, s)
+
+    def _fetch(sid: str, arm: Tuple[str, str]) -> List[Dict]:
+        if fetch_mode != "raw" and not _acquire():
+            return []
+        _use(arm, "posts")
+        _use(arm, "calls")
+        rows = fetch_submission_comments(
+            submission_id=sid,
+            limit=per_submission_limit,
+            sort="new",
+            only_root=False,
+            reddit=get_thread_client() if fetch_mode != "raw" else None,
+            mode=fetch_mode,
+            more_budget=more_budget,
+            # raw: o limiter vale para cada requisição (inclusive morechildren)
+            limiter=limiter if fetch_mode == "raw" else None,
+        )
+        for row in rows:
+            row["search_query"], row["search_subreddit"] = arm
+        return rows
 
-            for sub in submissions:
-                sid = sub.id
-                if sid in seen_submissions:
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="reddit")
+    pending = set()
+    emitted = 0
+    # Futures ainda não repassados por inteiro -> par que os originou
+    fut_arm: Dict = {}
+
+    def _collect(block_all: bool) -> Iterator[Dict]:
+        # Espera ao menos um post terminar (ou todos, no fim) e repassa seus comentários
+        nonlocal pending, emitted
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    rows = fut.result()
+                except Exception as e:
+                    logger.warning("[Reddit] falha ao coletar um post: %s", e)
+                    fut_arm.pop(fut, None)
                     continue
-                seen_submissions.add(sid)
-
-                rows = fetch_submission_comments(
-                    submission_id=sid,
-                    limit=per_submission_limit,
-                    sort="new",
-                    only_root=False,
-                )
-                total.extend(rows)
-
-                if len(total) >= max_total:
-                    break
-
-    if len(total) > max_total:
-        total = total[:max_total]
-    return total
+                for row in rows:
+                    if emitted >= max_total:
+                        return
+                    emitted += 1
+                    yield row
+                fut_arm.pop(fut, None)
+            if not block_all:
+                return
+
+    try:
+        for sid, arm in _submission_ids():
+            if emitted >= max_total:
+                _use(arm, "truncated")
+                break
+            if sid in seen_submissions:
+                continue
+            seen_submissions.add(sid)
+            fut = pool.submit(_fetch, sid, arm)
+            fut_arm[fut] = arm
+            pending.add(fut)
+            # Poucos posts em voo além dos workers: não busca muito além do max_total
+            if len(pending) >= 2 * workers:
+                yield from _collect(block_all=False)
+        yield from _collect(block_all=True)
+    finally:
+        for fut in pending:
+            fut.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+        # Posts cancelados ou com comentários descartados: o par não teve a colheita completa
+        for arm in set(fut_arm.values()):
+            if usage is not None and not usage.get(arm, {}).get("truncated"):
+                _use(arm, "truncated")
+
+
+def search_and_collect_comments(
+    queries: List[str],
+    subreddits: List[str],
+    limit_per_query: int = 15,
+    time_filter: str = "week",
+    sort: str = "new",
+    per_submission_limit: int = 80,
+    max_total: int = 300,
+    workers: int = 4,
+    limiter=None,
+    fetch_mode: str = "praw",
+    more_budget: int = 10,
+    pairs: Optional[List[Tuple[str, str]]] = None,
+    usage: Optional[Dict[Tuple[str, str], Dict[str, int]]] = None,
+) -> List[Dict]:
+    """Versão em lista de iter_search_comments."""
+    return list(iter_search_comments(
+        queries,
+        subreddits,
+        limit_per_query=limit_per_query,
+        time_filter=time_filter,
+        sort=sort,
+        per_submission_limit=per_submission_limit,
+        max_total=max_total,
+        workers=workers,
+        limiter=limiter,
+        fetch_mode=fetch_mode,
+        more_budget=more_budget,
+        pairs=pairs,
+        usage=usage,
+    ))
@@ -0,0 +1,65 @@
+# src/ingestion/reddit_stream.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List
+
+from .reddit_client import get_client
+from .reddit import comment_to_row
+
+logger = logging.getLogger("ingestion.reddit_stream")
+
+
+def stream_comments(subreddits: List[str], stop: threading.Event, reddit=None) -> Iterator[Dict]:
+    """
+    Comentários novos dos subreddits (r/a+b), conforme são postados, até stop ser sinalizado.
+    Usa o stream do PRAW com pause_after=0 para conferir stop entre as consultas; erros de
+    rede reiniciam o stream com backoff. Só a primeira conexão pula o que já existia: nas
+    seguintes o stream novo (sem memória do anterior) repassa os ~100 comentários mais recentes,
+    e o conjunto `seen` descarta os já entregues — o que foi postado durante a queda entra,
+    até o limite dessa listagem.
+    """
+    reddit = reddit or get_client()
+    sr = reddit.subreddit("+".join(subreddits or ["all"]))
+    seen: "OrderedDict[str, None]" = OrderedDict()
+    skip_existing = True
+    backoff = 1.0
+    while not stop.is_set():
+        try:
+            for c in sr.stream.comments(skip_existing=skip_existing, pause_after=0):
+                if stop.is_set():
+                    return
+                if c is None:
+                    continue
+                backoff = 1.0
+                if c.id in seen:
+                    continue
+                seen[c.id] = None
+                if len(seen) > 5000:
+                    seen.popitem(last=False)
+                # link_id = "t3_<post>": evita buscar o Submission só para ter o id
+                yield comment_to_row(c, c.link_id.split("_", 1)[-1])
+        except Exception as e:
+            logger.warning("[Reddit] stream interrompido (%s); reiniciando em %.0fs", e, backoff)
+            skip_existing = False
+            stop.wait(backoff)
+            backoff = min(backoff * 2, 60.0)
+    return
+
+
+def next_batch(q, size: int, max_wait: float, stop: threading.Event) -> List[Dict]:
+    """Até `size` itens da fila em no máximo `max_wait`s (pode voltar vazio; aí quem chama faz flush/checa stop)."""
+    import queue
+
+    batch: List[Dict] = []
+    deadline = time.monotonic() + max_wait
+    while len(batch) < size and not (stop.is_set() and q.empty()):
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(q.get(timeout=min(timeout, 0.5)))
+        except queue.Empty:
+            continue
+    return batch
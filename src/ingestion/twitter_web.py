@@ -1,18 +1,9 @@
 # src/ingestion/twitter_web.py
 from typing import List, Dict, Any
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 import time
 
-def _build_driver():
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+from .browser_pool import get_pool
 
 def _collect_tweets(driver, limit: int) -> List[Dict]:
     data: List[Dict] = []
@@ -98,15 +89,11 @@ def scrape_twitter_post(url: str, limit: int = 10) -> List[Dict]:
     return _scrape(url, limit)
 
 def _scrape(url: str, limit: int) -> List[Dict]:
-    driver = _build_driver()
-    driver.get(url)
-    time.sleep(5)
-    
-    try:
-        data = _collect_tweets(driver, limit)
-    finally:
-        driver.quit()
-    return data
+    # Sessão quente do pool (sem abrir Chrome a cada requisição)
+    with get_pool("twitter").session() as session:
+        session.driver.get(url)
+        time.sleep(5)
+        return _collect_tweets(session.driver, limit)
 
 def scrape_twitter_many(body: dict, limit: int = 10) -> Dict[str, Any]:
     profiles = body.get("profiles", []) or []
@@ -115,14 +102,12 @@ def scrape_twitter_many(body: dict, limit: int = 10) -> Dict[str, Any]:
 
     total_items = len(profiles) + len(hashtags) + len(posts)
 
-    driver = _build_driver()
-    time.sleep(2)
-
     profiles_results: List[Dict[str, Any]] = []
     hashtags_results: List[Dict[str, Any]] = []
     posts_results: List[Dict[str, Any]] = []
 
-    try:
+    with get_pool("twitter").session() as session:
+        driver = session.driver
         for username in profiles:
             url = f"https://twitter.com/{username}"
             print(f"👤 Varrendo perfil @{username}")
@@ -146,8 +131,6 @@ def scrape_twitter_many(body: dict, limit: int = 10) -> Dict[str, Any]:
             data = _collect_tweets(driver, limit)
             posts_results.append({"id": url, "data": data})
 
-    finally:
-        driver.quit()
-        print(f"🧹 Sessão encerrada após {total_items} itens.")
+        print(f"🧹 Sessão devolvida ao pool após {total_items} itens.")
         
     return { "sumary": {"total": total_items, "sucess": len(profiles_results + hashtags_results + posts_results)}, "profiles": profiles_results, "hashtags": hashtags_results, "posts": posts_results }
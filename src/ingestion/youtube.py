@@ -2,13 +2,17 @@
 src/ingestion/youtube.py
 """
 import os
-import time
+import queue
+import threading
 import logging
-import pandas as pd
-from typing import List, Dict, Tuple
-from googleapiclient.discovery import build
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Dict, Optional, Set, Tuple, TYPE_CHECKING
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    import pandas as pd
+    from common.ratelimit import RateLimiter
+
 logger = logging.getLogger("ingestion.youtube")
 
 # carrega variáveis do .env
@@ -27,37 +31,116 @@ def _extract_video_id(url_or_id: str) -> str:
     return url_or_id
 
 
+# Só o que normalize_comment/normalize_reply leem (menos bytes por página)
+_SNIPPET_FIELDS = "authorDisplayName,textDisplay,likeCount,publishedAt"
+THREAD_FIELDS = (
+    "nextPageToken,"
+    f"items(id,snippet(videoId,totalReplyCount,topLevelComment(snippet({_SNIPPET_FIELDS}))))"
+)
+THREAD_FIELDS_WITH_REPLIES = (
+    "nextPageToken,"
+    f"items(id,snippet(videoId,totalReplyCount,topLevelComment(snippet({_SNIPPET_FIELDS}))),"
+    f"replies(comments(id,snippet({_SNIPPET_FIELDS}))))"
+)
+REPLY_FIELDS = f"nextPageToken,items(id,snippet({_SNIPPET_FIELDS}))"
+
+_local = threading.local()
+
+
+def _client(api_key: str):
+    # Os objetos do googleapiclient (httplib2) não são thread-safe: um cliente por thread
+    clients = getattr(_local, "clients", None)
+    if clients is None:
+        clients = _local.clients = {}
+    if api_key not in clients:
+        from googleapiclient.discovery import build
+
+        clients[api_key] = build("youtube", "v3", developerKey=api_key, cache_discovery=False)
+    return clients[api_key]
+
+
+def _threads_request(youtube, video_id: str, page_size: int, include_replies: bool):
+    return youtube.commentThreads().list(
+        part="snippet,replies" if include_replies else "snippet",
+        videoId=video_id,
+        maxResults=min(page_size, 100),
+        textFormat="plainText",
+        order="time",
+        fields=THREAD_FIELDS_WITH_REPLIES if include_replies else THREAD_FIELDS,
+    )
+
+
+def _is_known(item: Dict, since: Optional[Tuple[str, Optional[str]]]) -> bool:
+    """Com order=time, ao achar o checkpoint (ou algo mais velho que ele) o resto já foi visto."""
+    if not since:
+        return False
+    known_id, known_published = since
+    if item.get("id") == known_id:
+        return True
+    published = item.get("snippet", {}).get("topLevelComment", {}).get("snippet", {}).get("publishedAt")
+    return bool(known_published and published and published < known_published)
+
+
+def _pages(request, next_fn, max_pages: int, limiter: Optional["RateLimiter"]) -> Iterator[Dict]:
+    page = 0
+    while request is not None and page < max_pages:
+        if limiter is not None and not limiter.acquire():
+            logger.warning("[YouTube] orçamento de cota esgotado; interrompendo a coleta")
+            return
+        response = request.execute()
+        yield response
+        request = next_fn(request, response)
+        page += 1
+
+
 def fetch_comments(
     video_id: str,
     api_key: str,
     max_pages: int = 3,
-    page_size: int = 100
+    page_size: int = 100,
+    include_replies: bool = False,
+    limiter: Optional["RateLimiter"] = None,
+    since: Optional[Tuple[str, Optional[str]]] = None,
 ) -> List[Dict]:
     """
-    Busca comentários usando a YouTube Data API v3.
+    Busca comentários usando a YouTube Data API v3 (itens crus de commentThreads,
+    só com os campos lidos por normalize_comment). Com since=(comment_id, publishedAt)
+    do último processado, para de paginar ao alcançá-lo.
     """
-    youtube = build("youtube", "v3", developerKey=api_key)
+    youtube = _client(api_key)
+    request = _threads_request(youtube, video_id, page_size, include_replies)
+
     comments_raw: List[Dict] = []
+    for page, response in enumerate(_pages(request, youtube.commentThreads().list_next, max_pages, limiter)):
+        items = response.get("items", [])
+        fresh = [it for it in items if not _is_known(it, since)]
+        comments_raw.extend(fresh)
+        logger.info(f"[YouTube] {video_id} página {page+1}: {len(fresh)} comentários novos")
+        if len(fresh) < len(items):
+            break
+
+    return comments_raw
 
-    request = youtube.commentThreads().list(
+
+def fetch_replies(
+    parent_id: str,
+    api_key: str,
+    max_pages: int = 10,
+    limiter: Optional["RateLimiter"] = None,
+) -> List[Dict]:
+    """Todas as respostas de um comentário (a parte 'replies' da thread traz no máximo 5)."""
+    youtube = _client(api_key)
+    request = youtube.comments().list(
         part="snippet",
-        videoId=video_id,
-        maxResults=min(page_size, 100),
+        parentId=parent_id,
+        maxResults=100,
         textFormat="plainText",
-        order="time"
+        fields=REPLY_FIELDS,
     )
-
-    page = 0
-    while request and page < max_pages:
-        response = request.execute()
-        items = response.get("items", [])
-        comments_raw.extend(items)
-        logger.info(f"[YouTube] Página {page+1}: {len(items)} comentários")
-        request = youtube.commentThreads().list_next(request, response)
-        page += 1
-        time.sleep(0.3)
-
-    return comments_raw
+    out: List[Dict] = []
+    for response in _pages(request, youtube.comments().list_next, max_pages, limiter):
+        out.extend(response.get("items", []))
+    return out
 
 
 def normalize_comment(item: Dict) -> Dict:
@@ -72,14 +155,144 @@ def normalize_comment(item: Dict) -> Dict:
         "author": top.get("authorDisplayName"),
         "text": top.get("textDisplay", ""),
         "likeCount": top.get("likeCount", 0),
-        "publishedAt": top.get("publishedAt")
+        "publishedAt": top.get("publishedAt"),
+        "source_id": snippet.get("videoId"),
+    }
+
+
+def normalize_reply(item: Dict, parent_id: str, video_id: str) -> Dict:
+    """Normaliza uma resposta (recurso comments) no mesmo formato de normalize_comment."""
+    snippet = item.get("snippet", {})
+    return {
+        "comment_id": item.get("id", ""),
+        "author": snippet.get("authorDisplayName"),
+        "text": snippet.get("textDisplay", ""),
+        "likeCount": snippet.get("likeCount", 0),
+        "publishedAt": snippet.get("publishedAt"),
+        "source_id": video_id,
+        "parent_id": parent_id,
     }
 
 
-def get_youtube_comments(url_or_id: str, limit: int = 100) -> pd.DataFrame:
+def _video_comments(
+    video_id: str,
+    api_key: str,
+    max_pages: int,
+    page_size: int,
+    include_replies: bool,
+    limiter: Optional["RateLimiter"],
+    since: Optional[Tuple[str, Optional[str]]] = None,
+    complete: Optional[Set[str]] = None,
+) -> Iterator[Dict]:
+    """
+    complete recebe video_id quando a coleta cobriu todo o delta: alcançou o checkpoint, acabaram
+    as páginas ou não havia checkpoint (a primeira coleta define a janela). Parar antes disso
+    (max_pages, cota esgotada) deixa um buraco entre o checkpoint e a página mais velha lida.
+    """
+    youtube = _client(api_key)
+    request = _threads_request(youtube, video_id, page_size, include_replies)
+    last = None
+    for response in _pages(request, youtube.commentThreads().list_next, max_pages, limiter):
+        last = response
+        for item in response.get("items", []):
+            if _is_known(item, since):
+                logger.info("[YouTube] %s: checkpoint alcançado", video_id)
+                if complete is not None:
+                    complete.add(video_id)
+                return
+            yield normalize_comment(item)
+            if not include_replies:
+                continue
+            inline = item.get("replies", {}).get("comments", [])
+            total = item.get("snippet", {}).get("totalReplyCount", 0)
+            if total > len(inline):
+                inline = fetch_replies(item["id"], api_key, limiter=limiter)
+            for reply in inline:
+                yield normalize_reply(reply, item["id"], video_id)
+    if complete is None:
+        return
+    if not since or (last is not None and not last.get("nextPageToken")):
+        complete.add(video_id)
+    else:
+        logger.warning(
+            "[YouTube] %s: coleta parou antes do checkpoint (max_pages/cota); checkpoint mantido",
+            video_id,
+        )
+
+
+def iter_comments(
+    video_ids: Iterable[str],
+    api_key: str,
+    max_pages: int = 3,
+    page_size: int = 100,
+    include_replies: bool = False,
+    workers: int = 8,
+    limiter: Optional["RateLimiter"] = None,
+    queue_size: int = 1000,
+    since: Optional[Dict[str, Tuple[str, Optional[str]]]] = None,
+    complete: Optional[Set[str]] = None,
+) -> Iterator[Dict]:
+    """
+    Comentários normalizados de vários vídeos, coletados em paralelo (`workers` vídeos
+    ao mesmo tempo) e entregues em stream, conforme as páginas chegam. O limiter
+    (QPS + orçamento de cota) é compartilhado por todas as threads. A fila é limitada:
+    se quem consome atrasa, a coleta espera. Um vídeo que falha (ex.: comentários
+    desativados) é registrado e pulado. since: {video_id: checkpoint} para coleta
+    incremental (ver ingestion/checkpoints.py), com as chaves já passadas por
+    _extract_video_id; complete recebe os vídeos cujo checkpoint pode avançar.
+    """
+    video_ids = [_extract_video_id(v) for v in dict.fromkeys(video_ids)]
+    out: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    done = object()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker(video_id: str):
+        try:
+            comments = _video_comments(
+                video_id, api_key, max_pages, page_size, include_replies, limiter,
+                since=(since or {}).get(video_id),
+                complete=complete,
+            )
+            for comment in comments:
+                if not _put(comment):
+                    return
+        except Exception as e:
+            logger.warning("[YouTube] falha no vídeo %s: %s", video_id, e)
+        finally:
+            _put(done)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="youtube")
+    for video_id in video_ids:
+        pool.submit(_worker, video_id)
+    try:
+        remaining = len(video_ids)
+        while remaining:
+            item = out.get()
+            if item is done:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        # Consumidor parou antes do fim: libera as threads presas na fila
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def get_youtube_comments(url_or_id: str, limit: int = 100) -> "pd.DataFrame":
     """
     Função de alto nível para buscar comentários normalizados em DataFrame.
     """
+    import pandas as pd
+
     if not YOUTUBE_API_KEY:
         raise RuntimeError("YOUTUBE_API_KEY não configurada no .env")
 
@@ -88,3 +301,19 @@ def get_youtube_comments(url_or_id: str, limit: int = 100) -> pd.DataFrame:
     normalized = [normalize_comment(item) for item in raw_comments]
 
     return pd.DataFrame(normalized[:limit])
+
+
+def get_youtube_comments_many(urls_or_ids: List[str], limit: int = 100, workers: int = 8) -> "pd.DataFrame":
+    """Como get_youtube_comments, para vários vídeos de uma vez (até `limit` por vídeo)."""
+    import pandas as pd
+
+    if not YOUTUBE_API_KEY:
+        raise RuntimeError("YOUTUBE_API_KEY não configurada no .env")
+
+    counts: Dict[str, int] = {}
+    rows = []
+    for c in iter_comments(urls_or_ids, YOUTUBE_API_KEY, max_pages=limit // 100 + 1, workers=workers):
+        if counts.get(c["source_id"], 0) < limit:
+            counts[c["source_id"]] = counts.get(c["source_id"], 0) + 1
+            rows.append(c)
+    return pd.DataFrame(rows)
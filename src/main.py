@@ -4,28 +4,22 @@ CLI do MVP: roda o pipeline completo para YouTube OU Reddit.
 - YouTube por vídeo:            --video-id <ID>
 - Reddit por post específico:    --reddit-submission <ID>
 - Reddit busca inteligente:      --reddit-search-auto  (usa vocabulário para montar queries)
+- Reddit em tempo real:          --reddit-stream --subreddits a,b  (processo contínuo)
 """
 
 import argparse
 import logging
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from common.config import load_settings, get_env
 from common.models import CommentRecord
 from services.vocab_client import fetch_vocab
-from ingestion.youtube import fetch_comments, normalize_comment
-from ingestion.reddit import fetch_submission_comments
 from ingestion.reddit_util import extract_submission_id
-from preprocess.text import Preprocessor
-from rules.filter import compile_regex_patterns, apply_rules
-from semantic.encoder import SemanticEncoder
-from classify.aggregator import aggregate_risk
-from services.perspective import get_sexually_explicit_score
-from storage.firestore import (
-    get_client as fs_client,
-    save_records as fs_save,
-    delete_older_than as fs_ttl,
-)
+from classify.scoring import CascadeStats, build_stages, score_options, score_texts
+from services.perspective import PerspectiveStats
+
+# Dependências pesadas (spaCy, sentence-transformers, Firestore, clientes de API)
+# são importadas só quando o estágio correspondente roda; ver tools/bench_startup.py.
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("main")
@@ -39,7 +33,9 @@ def resolve_source(args) -> Tuple[str, str]:
     raise SystemExit("Informe --video-id (YouTube) ou --reddit-submission (Reddit).")
 
 
-def _queries_from_vocab(keywords: List[str], examples: List[str], max_terms: int = 20) -> List[str]:
+def _queries_from_vocab(keywords: List[str], examples: List[str], max_terms: Optional[int] = 20,
+                        chunk: int = 5) -> List[str]:
+    """Termos únicos do vocabulário (frases entre aspas), agrupados de `chunk` em `chunk` com OR."""
     def _san(s: str) -> str:
         s = (s or "").strip()
         return f"\"{s}\"" if " " in s else s
@@ -54,9 +50,8 @@ def _queries_from_vocab(keywords: List[str], examples: List[str], max_terms: int
             uniq.append(t)
             seen.add(tl)
 
-    chunk = 5
     queries: List[str] = []
-    upto = min(len(uniq), max_terms)
+    upto = len(uniq) if max_terms is None else min(len(uniq), max_terms)
     for i in range(0, upto, chunk):
         group = uniq[i:i + chunk]
         queries.append(" OR ".join(group))
@@ -64,48 +59,104 @@ def _queries_from_vocab(keywords: List[str], examples: List[str], max_terms: int
 
 
 
+def _to_records(items, scored_all, platform: str, source_id, examples: List[str], vocab_version) -> List[CommentRecord]:
+    """(comment_id, payload, texto) + ScoredComment -> CommentRecord, com os extras de cada estágio."""
+    results: List[CommentRecord] = []
+    for (comment_id, payload, text), scored in zip(items, scored_all):
+        extras = {
+            "likeCount": payload.get("likeCount", 0),
+            "publishedAt": payload.get("publishedAt"),
+            "permalink": payload.get("permalink"),
+        }
+        if payload.get("parent_id"):
+            extras["parent_id"] = payload["parent_id"]
+        if scored.skipped:
+            extras["cascade_skipped"] = scored.skipped
+        if scored.semantic_example is not None:
+            extras["semantic_example"] = examples[scored.semantic_example]
+        if scored.cluster is not None:
+            # Campanha/copypasta: id do cluster = comment_id do representante
+            extras["dup_cluster"] = items[scored.cluster][0]
+            extras["dup_cluster_size"] = scored.cluster_size
+            if scored.duplicate_of is not None:
+                extras["dup_inherited"] = True
+
+        rec = CommentRecord(
+            platform="reddit" if platform == "reddit_auto" else platform,  
+            source_id=payload.get("source_id") or source_id,
+            comment_id=comment_id,
+            author=payload.get("author"),
+            text=text,
+            preprocessed=scored.preprocessed,
+            rule_hits=scored.rule_hits,
+            semantic_score=scored.semantic_score,
+            perspective_sexual=scored.perspective_sexual,
+            final_score=scored.final_score,
+            classification=scored.classification,
+            extras=extras,
+            vocab_version=vocab_version,
+        )
+        results.append(rec)
+    return results
+
+
 def run_pipeline(args) -> List[CommentRecord]:
     settings = load_settings()
-    nlp_cfg = settings.nlp
     thr = settings.thresholds
-    svc = settings.services
     storage = settings.storage
 
     logger.info("Buscando vocabulário na Vocab API...")
     vocab = fetch_vocab()
     keywords = vocab.get("keywords_explicit", [])
     examples = vocab.get("examples_implicit", [])
-    regex_map = vocab.get("regex_patterns", {})
-    regex_compiled = compile_regex_patterns(regex_map)
-    logger.info("Vocab OK. KW=%d | EX=%d | Regex=%d", len(keywords), len(examples), len(regex_compiled))
-
-    pre = Preprocessor(nlp_cfg.get("spacy_model", "pt_core_news_sm"))
-    enc = SemanticEncoder("paraphrase-multilingual-MiniLM-L12-v2", examples)
-
+    pre, rules, enc = build_stages(settings, vocab)
+    logger.info(
+        "Vocab OK. KW=%d | EX=%d | Regex=%d",
+        len(keywords), len(examples), len(vocab.get("regex_patterns", {})),
+    )
+
+    checkpoints = None
+    planner = None
     if getattr(args, "reddit_search_auto", False):
-        platform = "reddit_auto"
-
-        def _san(s: str) -> str:
-            return (s or "").strip().lower()
-
-        raw_terms = [_san(k) for k in keywords] + [_san(e) for e in examples]
-        raw_terms = [t for t in raw_terms if t]  # remove vazios
-        # limita o total de termos para não estourar consultas:
-        max_terms = getattr(args, "reddit_max_terms", 50)
-        queries = raw_terms[:max_terms]
+        platform, source_id = "reddit_auto", None  # cada comentário traz o source_id do seu post
 
+        # Um termo por query: o planejador precisa saber qual termo rendeu cada comentário
+        terms = _queries_from_vocab(keywords, examples, max_terms=None, chunk=1)
         subreddits = [s.strip() for s in (getattr(args, "subreddits", "all") or "all").split(",") if s.strip()]
-        logger.info("Reddit busca inteligente → subreddits=%s | queries=%d", ",".join(subreddits), len(queries))
 
         from ingestion.reddit_search import search_and_collect_comments
+        from ingestion.query_planner import QueryPlanner
+        from common.ratelimit import RateLimiter
+
+        rd_cfg = settings.ingestion.get("reddit", {})
+        pl_cfg = rd_cfg.get("planner", {})
+        planner = QueryPlanner(
+            pl_cfg.get("stats_path", "data/cache/query_stats.json"),
+            exploration=float(pl_cfg.get("exploration", 1.0)),
+            explore_share=float(pl_cfg.get("explore_share", 0.25)),
+            decay=float(pl_cfg.get("decay", 0.9)),
+        )
+        pairs = planner.plan(terms, subreddits, budget=getattr(args, "reddit_max_terms", 20))
+        search_usage: dict = {}
+        logger.info(
+            "Reddit busca inteligente → subreddits=%s | %d buscas planejadas de %d termos (%d novas)",
+            ",".join(subreddits), len(pairs), len(terms), sum(1 for p in pairs if planner.stats(*p) is None),
+        )
+
         raw = search_and_collect_comments(
-            queries=queries,
+            queries=terms,
             subreddits=subreddits,
             limit_per_query=getattr(args, "reddit_posts_per_query", 10),
             time_filter=getattr(args, "reddit_time_filter", "week"),
             sort=getattr(args, "reddit_search_sort", "relevance"),
             per_submission_limit=getattr(args, "reddit_per_submission_limit", 200),
             max_total=getattr(args, "limit_total", 1000),
+            workers=int(rd_cfg.get("workers", 4)),
+            limiter=RateLimiter(qps=float(rd_cfg.get("qps", 1.5))),
+            fetch_mode=getattr(args, "reddit_fetch", None) or rd_cfg.get("fetch_mode", "praw"),
+            more_budget=int(rd_cfg.get("more_budget", 10)),
+            pairs=pairs,
+            usage=search_usage,
         )
 
     else:
@@ -117,12 +168,40 @@ def run_pipeline(args) -> List[CommentRecord]:
             if not youtube_key:
                 raise SystemExit("Defina YOUTUBE_API_KEY no .env para usar YouTube.")
 
-            logger.info("Coletando comentários do YouTube (video_id=%s)...", source_id)
-            raw = fetch_comments(
-                video_id=source_id,
-                page_size=getattr(args, "page_size", 50),
-                max_pages=getattr(args, "max_pages", 3),
+            from ingestion.youtube import _extract_video_id, iter_comments
+            from common.ratelimit import RateLimiter
+
+            yt_cfg = settings.ingestion.get("youtube", {})
+            # IDs puros (aceita URLs): são as chaves dos checkpoints (snippet.videoId)
+            video_ids = list(dict.fromkeys(
+                _extract_video_id(v.strip()) for v in source_id.split(",") if v.strip()
+            ))
+            from ingestion.checkpoints import CheckpointStore
+
+            checkpoints = CheckpointStore(
+                yt_cfg.get("checkpoint_path", "data/cache/checkpoints.sqlite"), platform="youtube"
             )
+            since = {} if getattr(args, "full_resync", False) else checkpoints.get_many(video_ids)
+            if since:
+                logger.info("[YouTube] coleta incremental: %d vídeo(s) com checkpoint", len(since))
+            complete_videos: set = set()
+            limiter = RateLimiter(
+                qps=float(yt_cfg.get("qps", 5)),
+                budget=yt_cfg.get("quota_budget"),
+            )
+            logger.info("Coletando comentários do YouTube (%d vídeo(s): %s)...", len(video_ids), source_id)
+            raw = list(iter_comments(
+                video_ids,
+                api_key=youtube_key,
+                max_pages=getattr(args, "max_pages", 3),
+                page_size=getattr(args, "page_size", 50),
+                include_replies=getattr(args, "youtube_replies", False),
+                workers=int(yt_cfg.get("workers", 8)),
+                limiter=limiter,
+                since=since,
+                complete=complete_videos,
+            ))
+            logger.info("[YouTube] cota usada: %d unidades", limiter.used)
 
         elif platform == "reddit":
             try:
@@ -130,12 +209,20 @@ def run_pipeline(args) -> List[CommentRecord]:
             except ValueError as e:
                 raise SystemExit(f"[Reddit] {e}")
 
+            from ingestion.reddit import fetch_submission_comments
+            from common.ratelimit import RateLimiter
+
+            rd_cfg = settings.ingestion.get("reddit", {})
+
             logger.info("Coletando comentários do Reddit (submission_id=%s)...", source_id)
             raw = fetch_submission_comments(
                 submission_id=source_id,
                 limit=getattr(args, "limit", 200),
                 sort=getattr(args, "reddit_sort", "top"),
                 only_root=getattr(args, "reddit_only_root", False),
+                mode=getattr(args, "reddit_fetch", None) or rd_cfg.get("fetch_mode", "praw"),
+                more_budget=int(rd_cfg.get("more_budget", 10)),
+                limiter=RateLimiter(qps=float(rd_cfg.get("qps", 1.5))),
             )
 
         else:
@@ -143,52 +230,32 @@ def run_pipeline(args) -> List[CommentRecord]:
 
     logger.info("Total bruto: %d", len(raw))
 
-    results: List[CommentRecord] = []
+    items = []
     for item in raw:
-        if platform in ("youtube",):
-            comment_id, payload = normalize_comment(item)
-        else:
-            comment_id = item["comment_id"]
-            payload = item
-
-        text = payload.get("text") or ""
-        preprocessed = pre.preprocess(text)
-
-        hits = apply_rules(text, preprocessed, keywords, regex_compiled)
-        sem_score = enc.score(preprocessed)
-
-        perspective_score = None
-        if bool(svc.get("perspective_enabled", False)):
-            perspective_score = get_sexually_explicit_score(text)
-
-        final_score, label = aggregate_risk(
-            rule_hits=hits,
-            semantic_score=sem_score,
-            thresholds=thr,
-            perspective_sexual=perspective_score,
-            perspective_weight=float(svc.get("perspective_weight", 0.4)),
+        # Todas as fontes já entregam o comentário normalizado (dict com comment_id/text/...)
+        items.append((item["comment_id"], item, item.get("text") or ""))
+
+    cascade_stats = CascadeStats()
+    persp_stats = PerspectiveStats()
+    scored_all = score_texts(
+        [text for _, _, text in items],
+        pre,
+        rules,
+        enc,
+        thr,
+        stats=cascade_stats,
+        perspective_stats=persp_stats,
+        **score_options(settings),
+    )
+
+    results = _to_records(items, scored_all, platform, source_id, examples, vocab.get("version"))
+    if args.persist:
+        from storage.firestore import (
+            get_client as fs_client,
+            save_records as fs_save,
+            delete_older_than as fs_ttl,
         )
 
-        rec = CommentRecord(
-            platform="reddit" if platform == "reddit_auto" else platform,  
-            source_id=payload.get("source_id") or source_id,
-            comment_id=comment_id,
-            author=payload.get("author"),
-            text=text,
-            preprocessed=preprocessed,
-            rule_hits=hits,
-            semantic_score=sem_score,
-            perspective_sexual=perspective_score,
-            final_score=final_score,
-            classification=label,
-            extras={
-                "likeCount": payload.get("likeCount", 0),
-                "publishedAt": payload.get("publishedAt"),
-                "permalink": payload.get("permalink"),
-            },
-        )
-        results.append(rec)
-    if args.persist:
         logger.info("Persistindo no Firestore (Firebase)...")
         client = fs_client()
         try:
@@ -201,25 +268,188 @@ def run_pipeline(args) -> List[CommentRecord]:
         created, _ = fs_save(client, "comments", results)
         logger.info("[Firestore] Gravados %d documentos (upsert).", created)
 
+    if planner is not None:
+        flagged: dict = {}
+        for (_, payload, _), rec in zip(items, results):
+            if rec.classification in ("suspeito", "atencao") and payload.get("search_query"):
+                arm = (payload["search_query"], payload["search_subreddit"])
+                flagged[arm] = flagged.get(arm, 0) + 1
+        planner.record(search_usage, flagged)
+        planner.save()
+        calls = sum(u["calls"] for u in search_usage.values())
+        logger.info("Planejador de buscas → %d sinalizados em %d chamadas (%.2f por chamada)",
+                    sum(flagged.values()), calls, sum(flagged.values()) / max(calls, 1))
+
+    if checkpoints is not None:
+        # Só depois de pontuar (e persistir): numa falha, a próxima execução refaz o delta.
+        # Vídeos cuja coleta parou antes do checkpoint mantêm o antigo (senão o buraco se perde)
+        from ingestion.checkpoints import newest_by_source
+
+        checkpoints.put_many(newest_by_source(
+            payload for _, payload, _ in items if payload.get("source_id") in complete_videos
+        ))
+        checkpoints.close()
+
     sus = sum(1 for r in results if r.classification == "suspeito")
     aten = sum(1 for r in results if r.classification == "atencao")
     ok = sum(1 for r in results if r.classification == "ok")
     logger.info("Resumo → suspeito=%d | atencao=%d | ok=%d", sus, aten, ok)
+    logger.info("Cache de pré-processamento → hits=%d | misses=%d", pre.cache.hits, pre.cache.misses)
+    if enc.store is not None:
+        logger.info("Cache de embeddings → hits=%d | misses=%d", enc.store.hits, enc.store.misses)
+    logger.info(
+        "Cascata → semântico: %d chamadas (%d evitadas) | Perspective: %d chamadas (%d evitadas)",
+        cascade_stats.semantic_calls, cascade_stats.semantic_saved,
+        cascade_stats.perspective_calls, cascade_stats.perspective_saved,
+    )
+    if persp_stats.requests or persp_stats.short_circuited or persp_stats.cache_hits:
+        logger.info(
+            "Perspective → cota usada: %d requisições (%d retries, %d 429) | %d sem score | %d com circuito aberto",
+            persp_stats.requests, persp_stats.retries, persp_stats.throttled,
+            persp_stats.failed, persp_stats.short_circuited,
+        )
+        logger.info(
+            "Cache da Perspective → hits=%d | misses=%d | hit ratio=%.1f%%",
+            persp_stats.cache_hits, persp_stats.cache_misses, 100 * persp_stats.hit_ratio,
+        )
+    logger.info("Quase-duplicatas → %d comentários herdaram o score do representante", cascade_stats.duplicates)
 
     return results
 
 
+def run_reddit_stream(args):
+    """
+    Modo contínuo: comentários novos dos --subreddits entram numa fila limitada (produtor em
+    thread), são pontuados em micro-lotes e gravados periodicamente. Os modelos são carregados
+    uma vez; o VocabWatcher troca regras/exemplos quando o vocabulário muda.
+    Fila cheia = o produtor espera (backpressure) em vez de acumular memória sem limite.
+    """
+    import queue
+    import signal
+    import threading
+    import time
+
+    from classify.vocab_watcher import VocabWatcher
+    from ingestion.reddit_client import get_client as reddit_client
+    from ingestion.reddit_stream import next_batch, stream_comments
+
+    settings = load_settings()
+    thr = settings.thresholds
+    st_cfg = settings.ingestion.get("reddit", {}).get("stream", {})
+    batch_size = int(st_cfg.get("batch_size", 64))
+    max_wait = float(st_cfg.get("max_wait", 5))
+    flush_interval = float(st_cfg.get("flush_interval", 30))
+    flush_size = int(st_cfg.get("flush_size", 500))
+
+    logger.info("Buscando vocabulário na Vocab API...")
+    vocab = fetch_vocab()
+    pre, rules, enc = build_stages(settings, vocab)
+    watcher = VocabWatcher(
+        vocab, rules, enc,
+        fold=bool(settings.rules.get("fold_evasive", False)),
+        interval=float(st_cfg.get("vocab_interval", 60)),
+    ).start()
+    options = score_options(settings)
+
+    subreddits = [s.strip() for s in (args.subreddits or "all").split(",") if s.strip()]
+    logger.info("Reddit stream → subreddits=%s | lote=%d | fila=%d", ",".join(subreddits),
+                batch_size, int(st_cfg.get("queue_size", 1000)))
+
+    stop = threading.Event()
+    q: "queue.Queue" = queue.Queue(maxsize=int(st_cfg.get("queue_size", 1000)))
+    # Na thread principal: sem credenciais, get_client() encerra aqui com a mensagem de erro
+    reddit = reddit_client()
+
+    def _produce():
+        try:
+            for row in stream_comments(subreddits, stop, reddit=reddit):
+                while not stop.is_set():
+                    try:
+                        q.put(row, timeout=1.0)
+                        break
+                    except queue.Full:
+                        continue
+        except BaseException as e:  # inclusive SystemExit: a thread não pode morrer calada
+            logger.error("[Reddit] produtor do stream falhou: %r", e)
+            stop.set()
+
+    producer = threading.Thread(target=_produce, name="reddit-stream", daemon=True)
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    fs = None
+    if args.persist:
+        from storage.firestore import get_client as fs_client, save_records as fs_save
+
+        fs = fs_client()
+
+    buffer: List[CommentRecord] = []
+    totals = {"scored": 0, "saved": 0, "suspeito": 0, "atencao": 0}
+    last_flush = time.monotonic()
+
+    def _flush():
+        nonlocal buffer, last_flush
+        last_flush = time.monotonic()
+        if buffer and fs is not None:
+            try:
+                created, _ = fs_save(fs, "comments", buffer)
+            except Exception as e:
+                # Falha passageira não derruba o stream: o buffer fica para o próximo flush
+                logger.error("[Firestore] gravação falhou (%d registros pendentes): %s", len(buffer), e)
+                return False
+            totals["saved"] += created
+        if buffer:
+            logger.info(
+                "Stream → %d pontuados (suspeito=%d | atencao=%d) | %d gravados | fila=%d",
+                totals["scored"], totals["suspeito"], totals["atencao"], totals["saved"], q.qsize(),
+            )
+        buffer = []
+        return True
+
+    producer.start()
+    try:
+        while not stop.is_set() or not q.empty():
+            rows = next_batch(q, batch_size, max_wait, stop)
+            if rows:
+                items = [(r["comment_id"], r, r.get("text") or "") for r in rows]
+                snap = watcher.snapshot()  # mesmo vocabulário do começo ao fim do lote
+                scored = score_texts(
+                    [text for _, _, text in items], pre, snap.rules, snap.enc, thr, **options
+                )
+                records = _to_records(items, scored, "reddit", None, snap.examples, snap.version)
+                buffer.extend(records)
+                totals["scored"] += len(records)
+                for r in records:
+                    if r.classification in ("suspeito", "atencao"):
+                        totals[r.classification] += 1
+            if len(buffer) >= flush_size or time.monotonic() - last_flush >= flush_interval:
+                _flush()
+    except KeyboardInterrupt:
+        logger.info("Interrompido; gravando o que falta...")
+    finally:
+        stop.set()
+        if not _flush():
+            logger.error("[Firestore] %d registros não gravados ao encerrar", len(buffer))
+        watcher.stop()
+        producer.join(timeout=5)
+    logger.info("Stream encerrado → %d comentários pontuados, %d gravados", totals["scored"], totals["saved"])
+
+
 def main():
     parser = argparse.ArgumentParser(description="Pipeline de análise de comentários (YouTube/Reddit).")
 
-    parser.add_argument("--video-id", help="YouTube: ID do vídeo (ex.: dQw4w9WgXcQ)")
+    parser.add_argument("--video-id", help="YouTube: ID do vídeo (ex.: dQw4w9WgXcQ); vários separados por vírgula")
     parser.add_argument("--reddit-submission", help="Reddit: ID do post (base36 da URL /comments/<ID>/)")
     parser.add_argument("--reddit-search-auto", action="store_true",
                         help="Reddit: usa o vocabulário para buscar posts e coletar comentários dos resultados.")
+    parser.add_argument("--reddit-stream", action="store_true",
+                        help="Reddit: acompanha os comentários novos dos --subreddits continuamente (Ctrl+C encerra).")
 
     # YouTube
     parser.add_argument("--page-size", type=int, default=50, help="YouTube: tamanho da página (default=50)")
-    parser.add_argument("--max-pages", type=int, default=3, help="YouTube: número máximo de páginas (default=3)")
+    parser.add_argument("--max-pages", type=int, default=3, help="YouTube: número máximo de páginas por vídeo (default=3)")
+    parser.add_argument("--youtube-replies", action="store_true", help="YouTube: inclui as respostas dos comentários")
+    parser.add_argument("--full-resync", action="store_true",
+                        help="YouTube: ignora os checkpoints e recoleta desde o início (até --max-pages)")
 
     # Reddit (post específico)
     parser.add_argument("--limit", type=int, default=200, help="Reddit (submission): máx. de comentários (default=200)")
@@ -229,10 +459,12 @@ def main():
                         help="Reddit (submission): ordenação dos comentários (default=new)")
     parser.add_argument("--reddit-only-root", action="store_true",
                         help="Reddit (submission): apenas comentários top-level (sem respostas)")
+    parser.add_argument("--reddit-fetch", choices=["praw", "raw"],
+                        help="Reddit: coleta via objetos PRAW ou JSON cru + morechildren (default: settings.yaml)")
 
     # Reddit (busca inteligente)
     parser.add_argument("--subreddits", default="all",
-                        help="Reddit (auto): lista separada por vírgula de subreddits. Ex.: brasil,paisefilhos")
+                        help="Reddit (auto/stream): lista separada por vírgula de subreddits. Ex.: brasil,paisefilhos")
     parser.add_argument("--reddit-posts-per-query", type=int, default=15,
                         help="Reddit (auto): quantos posts por query (default=15)")
     parser.add_argument("--reddit-per-submission-limit", type=int, default=80,
@@ -246,7 +478,8 @@ def main():
                         default="new",
                         help="Reddit (auto): ordenação de busca (default=new)")
     parser.add_argument("--reddit-max-terms", type=int, default=20,
-                        help="Reddit (auto): máx. de termos do vocabulário usados para gerar queries (default=20)")
+                        help="Reddit (auto): orçamento de buscas (query, subreddit) por execução, escolhidas "
+                             "pelo rendimento nas execuções anteriores (default=20)")
     parser.add_argument("--limit-total", type=int, default=300,
                         help="Reddit (auto): teto global de comentários coletados (default=300)")
 
@@ -254,10 +487,13 @@ def main():
 
     args = parser.parse_args()
 
-    if not (args.video_id or args.reddit_submission or args.reddit_search_auto):
-        parser.error("Escolha uma fonte: --video-id OU --reddit-submission OU --reddit-search-auto")
+    if not (args.video_id or args.reddit_submission or args.reddit_search_auto or args.reddit_stream):
+        parser.error("Escolha uma fonte: --video-id OU --reddit-submission OU --reddit-search-auto OU --reddit-stream")
 
-    run_pipeline(args)
+    if args.reddit_stream:
+        run_reddit_stream(args)
+    else:
+        run_pipeline(args)
 
 
 if __name__ == "__main__":
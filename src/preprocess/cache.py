@@ -0,0 +1,112 @@
+"""
+src/preprocess/cache.py
+Cache dos textos já lematizados: LRU em memória + (opcional) SQLite em disco.
+A chave é o hash do texto normalizado + nome/versão do modelo spaCy + versão do
+pré-processamento (código e stopwords, ver preprocess.text), então comentários repetidos
+(spam, "kkkk", respostas copiadas) só passam pelo spaCy uma vez e nada de uma versão
+antiga é reaproveitado.
+O SQLite também fica limitado a max_size linhas: as gravadas há mais tempo saem primeiro.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger("preprocess.cache")
+
+
+def make_key(normalized_text: str, model_id: str, version: str) -> str:
+    h = hashlib.sha1()
+    for part in (model_id, version, normalized_text):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class PreprocessCache:
+    def __init__(self, max_size: int = 50_000, path: Optional[str] = None):
+        self.max_size = max_size
+        self._mem: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_rows = 0  # limite superior do nº de linhas no disco (recontado ao aparar)
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS preprocessed (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+            (self._db_rows,) = self._db.execute("SELECT COUNT(*) FROM preprocessed").fetchone()
+            self._trim()
+
+    def _trim(self):
+        if self._db_rows <= self.max_size:
+            return
+        # Sem AUTOINCREMENT, toda linha (re)gravada recebe o maior rowid: ordem de gravação
+        cur = self._db.execute(
+            "DELETE FROM preprocessed WHERE rowid IN "
+            "(SELECT rowid FROM preprocessed ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+            (self.max_size,),
+        )
+        self._db.commit()
+        (self._db_rows,) = self._db.execute("SELECT COUNT(*) FROM preprocessed").fetchone()
+        logger.debug("[Cache] %d textos antigos removidos do disco", cur.rowcount)
+
+    def _remember(self, key: str, value: str):
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_size:
+            self._mem.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Retorna {key: valor} para as chaves encontradas (memória, depois disco)."""
+        found: Dict[str, str] = {}
+        pending = []
+        for key in keys:
+            if key in found:
+                continue
+            value = self._mem.get(key)
+            if value is not None:
+                self._mem.move_to_end(key)
+                found[key] = value
+            else:
+                pending.append(key)
+
+        if self._db is not None and pending:
+            # SQLite limita o nº de parâmetros por consulta
+            for i in range(0, len(pending), 500):
+                chunk = pending[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, value FROM preprocessed WHERE key IN ({marks})", chunk
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = value
+                    self._remember(key, value)
+
+        return found
+
+    def put_many(self, items: Dict[str, str]):
+        for key, value in items.items():
+            self._remember(key, value)
+        if self._db is not None and items:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO preprocessed (key, value) VALUES (?, ?)", items.items()
+            )
+            self._db.commit()
+            self._db_rows += len(items)
+            self._trim()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._mem)}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,120 @@
+"""
+src/preprocess/dedup.py
+Agrupamento de quase-duplicatas (copypasta de campanhas coordenadas) antes da pontuação.
+- Texto normalizado (fold_text + espaços) igual -> mesmo cluster, qualquer tamanho.
+- Textos com pelo menos min_chars: MinHash (num_perm hashes) sobre shingles de caracteres
+  + LSH por bandas. Só representantes que coincidem em alguma banda inteira são comparados,
+  e entram no cluster se a similaridade de Jaccard estimada for >= threshold.
+O índice é incremental (add por comentário), então serve tanto a um lote quanto a um stream.
+"""
+
+import hashlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from rules.filter import fold_text
+
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+
+
+def normalize(text: str) -> str:
+    return " ".join(fold_text(text).split())
+
+
+def _shingle_hashes(text: str, k: int) -> np.ndarray:
+    shingles = {text} if len(text) <= k else {text[i:i + k] for i in range(len(text) - k + 1)}
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+         for s in shingles],
+        dtype=np.uint64,
+    )
+
+
+def _mix(z: np.ndarray) -> np.ndarray:
+    # finalizador do splitmix64 (multiplicação em uint64 dá a volta em 2^64)
+    z = (z ^ (z >> np.uint64(30))) * _M1
+    z = (z ^ (z >> np.uint64(27))) * _M2
+    return z ^ (z >> np.uint64(31))
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 64, shingle: int = 4, seed: int = 0):
+        self.shingle = shingle
+        self.seeds = np.random.default_rng(seed).integers(0, 2**63, num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = _shingle_hashes(text, self.shingle)
+        with np.errstate(over="ignore"):
+            return _mix(hashes[:, None] ^ self.seeds[None, :]).min(axis=0)
+
+
+class NearDuplicateIndex:
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        min_chars: int = 20,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle: int = 4,
+    ):
+        self.threshold = threshold
+        self.min_chars = min_chars
+        self.hasher = MinHasher(num_perm=num_perm, shingle=shingle)
+        self.rows = num_perm // bands
+        self._exact: Dict[str, int] = {}
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[int, np.ndarray] = {}  # assinatura do representante de cada cluster
+        self.sizes: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def _bands(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[b * self.rows:(b + 1) * self.rows].tobytes() for b in range(len(self._buckets))]
+
+    def add(self, text: str) -> Tuple[int, bool]:
+        """(id do cluster, True se este texto abriu um cluster novo = representante)."""
+        norm = normalize(text)
+        cluster = self._exact.get(norm)
+        if cluster is not None:
+            self.sizes[cluster] += 1
+            return cluster, False
+
+        sig = None
+        if len(norm) >= self.min_chars:
+            sig = self.hasher.signature(norm)
+            keys = self._bands(sig)
+            seen = set()
+            for bucket, key in zip(self._buckets, keys):
+                for cand in bucket.get(key, ()):
+                    if cand in seen:
+                        continue
+                    seen.add(cand)
+                    if np.mean(self._signatures[cand] == sig) >= self.threshold:
+                        self._exact[norm] = cand
+                        self.sizes[cand] += 1
+                        return cand, False
+
+        cluster = len(self.sizes)
+        self.sizes.append(1)
+        self._exact[norm] = cluster
+        if sig is not None:
+            self._signatures[cluster] = sig
+            for bucket, key in zip(self._buckets, keys):
+                bucket.setdefault(key, []).append(cluster)
+        return cluster, True
+
+
+def cluster_texts(texts: List[str], threshold: float = 0.7, min_chars: int = 20) -> List[int]:
+    """Para cada texto, o índice (em texts) do representante do seu cluster (ele mesmo, se for)."""
+    index = NearDuplicateIndex(threshold=threshold, min_chars=min_chars)
+    rep_of_cluster: List[int] = []
+    reps: List[int] = []
+    for i, text in enumerate(texts):
+        cluster, new = index.add(text)
+        if new:
+            rep_of_cluster.append(i)
+        reps.append(rep_of_cluster[cluster])
+    return reps
@@ -3,37 +3,64 @@ src/preprocess/text.py
 Foco é limpeza, normalização e lematização (PT-BR).
 """
 
+import hashlib
 import re
-import nltk
-import spacy
-from typing import Optional
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
 import logging
 
+from preprocess.cache import PreprocessCache, make_key
+
 logger = logging.getLogger("preprocess.text")
 
+# A lematização só depende de tokenizer + tok2vec/morphologizer + attribute_ruler + lemmatizer.
+# Parser e NER são os componentes mais caros do pt_core_news_sm e não influenciam o lemma.
+LEMMA_EXCLUDE = ["parser", "ner", "senter"]
+
+# Cópia da lista nltk.corpus.stopwords.words("portuguese"): evita importar o NLTK
+# e, principalmente, o nltk.download() em tempo de execução.
+STOPWORDS_PATH = Path(__file__).parent / "stopwords_pt.txt"
+
+# Entra na chave do cache junto com o hash das stopwords: incremente ao mudar _clean,
+# _lemmas ou LEMMA_EXCLUDE, para não reaproveitar textos pré-processados do jeito antigo.
+PREPROCESS_VERSION = 1
+
+
+def load_stopwords(path: Path = STOPWORDS_PATH) -> Set[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def stopwords_hash(stopwords: Iterable[str]) -> str:
+    return hashlib.sha1("\n".join(sorted(stopwords)).encode("utf-8")).hexdigest()[:12]
+
+
 class Preprocessor:
-    def __init__(self, spacy_model: str):
-        self._ensure_nltk()
-        self.nlp = spacy.load(spacy_model)
-        self.stopwords = set(nltk.corpus.stopwords.words("portuguese"))
-
-    def _ensure_nltk(self):
-        try:
-            nltk.data.find("tokenizers/punkt")
-        except LookupError:
-            nltk.download("punkt")
-        try:
-            nltk.data.find("corpora/stopwords")
-        except LookupError:
-            nltk.download("stopwords")
+    def __init__(
+        self,
+        spacy_model: str,
+        batch_size: int = 256,
+        n_process: int = 1,
+        cache: Optional[PreprocessCache] = None,
+    ):
+        import spacy  # import pesado: só quando o estágio de pré-processamento roda
 
-    def preprocess(self, text: str) -> str:
+        self.nlp = spacy.load(spacy_model, exclude=LEMMA_EXCLUDE)
+        self.stopwords = load_stopwords()
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.cache = cache
+        meta = self.nlp.meta
+        self.model_id = f"{meta.get('lang')}_{meta.get('name')}@{meta.get('version')}"
+        self.version = f"{PREPROCESS_VERSION}:{stopwords_hash(self.stopwords)}"
+
+    def _clean(self, text: str) -> str:
         text = re.sub(r"https?://\S+", " ", text)
         text = re.sub(r"[@#]\w+", " ", text)
 
-        text = text.lower().strip()
+        return text.lower().strip()
 
-        doc = self.nlp(text)
+    def _lemmas(self, doc) -> str:
         tokens = []
         for tok in doc:
             if tok.is_punct or tok.is_space:
@@ -46,3 +73,48 @@ class Preprocessor:
             tokens.append(lemma)
 
         return " ".join(tokens)
+
+    def preprocess(self, text: str) -> str:
+        return self.preprocess_batch([text], n_process=1)[0]
+
+    def preprocess_batch(
+        self,
+        texts: Iterable[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Mesma saída de preprocess() para cada texto, mas passando o lote inteiro
+        pelo nlp.pipe (e, se n_process != 1, por vários processos).
+        Textos repetidos ou já vistos no cache não passam de novo pelo spaCy.
+        """
+        cleaned = [self._clean(t or "") for t in texts]
+        if not cleaned:
+            return []
+
+        keys = [make_key(c, self.model_id, self.version) for c in cleaned]
+        done: Dict[str, str] = self.cache.get_many(keys) if self.cache is not None else {}
+
+        todo: Dict[str, str] = {}
+        for key, c in zip(keys, cleaned):
+            if key not in done:
+                todo.setdefault(key, c)
+
+        if self.cache is not None:
+            self.cache.misses += len(todo)
+            self.cache.hits += len(cleaned) - len(todo)
+
+        if todo:
+            batch_size = batch_size or self.batch_size
+            n_process = self.n_process if n_process is None else n_process
+            # Subir processos filhos custa mais do que lematizar um lote pequeno
+            if len(todo) <= batch_size:
+                n_process = 1
+
+            docs = self.nlp.pipe(todo.values(), batch_size=batch_size, n_process=n_process)
+            fresh = {key: self._lemmas(doc) for key, doc in zip(todo.keys(), docs)}
+            if self.cache is not None:
+                self.cache.put_many(fresh)
+            done.update(fresh)
+
+        return [done[key] for key in keys]
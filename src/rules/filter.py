@@ -3,7 +3,35 @@ src/rules/filter.py
 """
 
 import re
-from typing import List, Dict
+import unicodedata
+from typing import List, Dict, Optional, Set, Tuple
+
+from rules.matcher import KeywordMatcher, build_keyword_matcher
+
+# Construções que dependem da numeração/nome dos grupos ou de flags globais
+# não sobrevivem a serem embrulhadas numa alternância com grupos nomeados.
+_UNFUSABLE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(|^\(\?[aiLmsux]+\)")
+
+# Forma canônica para pegar grafias evasivas ("n1nf3ta", "novinhaaa", "ninféta"):
+# sem acento, leet -> letra e letras repetidas colapsadas.
+_LEET = str.maketrans({
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t",
+    "@": "a", "$": "s", "!": "i",
+})
+_REPEATS = re.compile(r"(.)\1+")
+_LONG_REPEATS = re.compile(r"(.)\1{2,}")
+
+def _unaccent_leet(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return text.translate(_LEET)
+
+def fold_text(text: str) -> str:
+    return _REPEATS.sub(r"\1", _unaccent_leet(text))
+
+def fold_text_doubled(text: str) -> str:
+    """fold_text que preserva letras dobradas: só repetições de 3+ viram 2 ("tweeeen" -> "tween")."""
+    return _LONG_REPEATS.sub(r"\1\1", _unaccent_leet(text))
 
 def compile_regex_patterns(regex_map: Dict[str, str]) -> Dict[str, re.Pattern]:
     compiled: Dict[str, re.Pattern] = {}
@@ -14,17 +42,15 @@ def compile_regex_patterns(regex_map: Dict[str, str]) -> Dict[str, re.Pattern]:
 def apply_rules(
     text_original: str,
     text_preprocessed: str,
-    keywords_explicit: List[str],
-    regex_compiled: Dict[str, re.Pattern]
+    matcher: KeywordMatcher,
+    regex_compiled: Dict[str, re.Pattern],
 ) -> List[str]:
+    """matcher: autômato das keywords, montado uma vez por vocabulário (build_keyword_matcher)."""
 
     hits: List[str] = []
-    haystacks = [text_original.lower(), text_preprocessed.lower()]
 
-    # Palavras-chave explícitas
-    for kw in keywords_explicit:
-        if any(kw.lower() in h for h in haystacks):
-            hits.append(f"KW:{kw}")
+    # Palavras-chave explícitas: uma passada do autômato por texto.
+    hits.extend(matcher.match([text_original, text_preprocessed]))
 
     # Regex (ex.: idade 10-17)
     for name, pattern in regex_compiled.items():
@@ -32,3 +58,108 @@ def apply_rules(
             hits.append(f"REGEX:{name}")
 
     return hits
+
+
+class RuleEngine:
+    """
+    Avaliação de regras montada uma vez por vocabulário: o autômato de keywords
+    (rules.matcher) + as regex nomeadas fundidas numa única alternância
+    (?P<r0>...)|(?P<r1>...)|..., varrida uma vez por texto.
+
+    Saída idêntica a apply_rules: "KW:<termo>" na ordem do vocab, depois
+    "REGEX:<nome>" na ordem de regex_compiled. Com fold=True, keywords e textos
+    passam por fold_text, então grafias evasivas também geram "KW:<termo>"
+    (sempre um superconjunto dos hits sem fold). Keywords com letra dobrada ("tween",
+    "grooming") usam fold_text_doubled num segundo autômato: colapsadas ("twen") casariam
+    com palavras comuns ("twenty"). As regex rodam no texto original.
+    """
+
+    def __init__(
+        self,
+        keywords_explicit: List[str],
+        regex_compiled: Dict[str, re.Pattern],
+        version: Optional[str] = None,
+        fold: bool = False,
+    ):
+        self.version = version
+        single, doubled = list(keywords_explicit), []
+        if fold:
+            single, doubled = [], []
+            for kw in keywords_explicit:
+                (doubled if _REPEATS.search(fold_text_doubled(kw)) else single).append(kw)
+        self.matcher = build_keyword_matcher(
+            single, version=version, normalize=fold_text if fold else str.lower
+        )
+        self.doubled_matcher: Optional[KeywordMatcher] = None
+        if doubled:
+            self.doubled_matcher = build_keyword_matcher(
+                doubled, version=version, normalize=fold_text_doubled
+            )
+        # Posição de cada keyword no vocab, para juntar os hits dos dois autômatos
+        self._kw_order: Dict[str, int] = {}
+        for i, kw in enumerate(keywords_explicit):
+            self._kw_order.setdefault(f"KW:{kw}", i)
+        self.regex_names: List[str] = list(regex_compiled.keys())
+        self.regex_compiled = regex_compiled
+
+        # Uma regex fundida por conjunto de flags; o resto fica no modo por padrão
+        self._fused: List[Tuple[re.Pattern, Dict[str, str]]] = []
+        self._single: List[str] = []
+
+        by_flags: Dict[int, List[str]] = {}
+        for name, pattern in regex_compiled.items():
+            if pattern.groupindex or _UNFUSABLE.search(pattern.pattern):
+                self._single.append(name)
+            else:
+                by_flags.setdefault(pattern.flags, []).append(name)
+
+        for flags, names in by_flags.items():
+            groups = {f"r{self.regex_names.index(n)}": n for n in names}
+            alternation = "|".join(
+                f"(?P<{g}>{regex_compiled[n].pattern})" for g, n in groups.items()
+            )
+            try:
+                self._fused.append((re.compile(alternation, flags), groups))
+            except re.error:
+                self._single.extend(names)
+
+    @classmethod
+    def from_vocab(cls, vocab: dict, fold: bool = False) -> "RuleEngine":
+        return cls(
+            vocab.get("keywords_explicit", []),
+            compile_regex_patterns(vocab.get("regex_patterns", {})),
+            version=vocab.get("version"),
+            fold=fold,
+        )
+
+    def _match_regex(self, texts: List[str]) -> Set[str]:
+        found: Set[str] = set()
+        for fused, groups in self._fused:
+            for text in texts:
+                matched = False
+                for m in fused.finditer(text):
+                    found.add(groups[m.lastgroup])
+                    matched = True
+                    if all(n in found for n in groups.values()):
+                        break
+                # Um casamento consome o trecho e pode esconder outro padrão que
+                # começa dentro dele: só nesse caso confere os restantes um a um.
+                if matched:
+                    for n in groups.values():
+                        if n not in found and self.regex_compiled[n].search(text):
+                            found.add(n)
+
+        for name in self._single:
+            pattern = self.regex_compiled[name]
+            if any(pattern.search(t) for t in texts):
+                found.add(name)
+        return found
+
+    def match(self, text_original: str, text_preprocessed: str) -> List[str]:
+        texts = [text_original, text_preprocessed]
+        hits = self.matcher.match(texts)
+        if self.doubled_matcher is not None:
+            hits = sorted(hits + self.doubled_matcher.match(texts), key=self._kw_order.__getitem__)
+        found = self._match_regex(texts)
+        hits.extend(f"REGEX:{name}" for name in self.regex_names if name in found)
+        return hits
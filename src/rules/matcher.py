@@ -0,0 +1,99 @@
+"""
+src/rules/matcher.py
+Autômato Aho–Corasick para as palavras-chave explícitas do vocabulário.
+Compilado uma vez por versão do vocab; cada texto é varrido em uma única passada,
+independente de quantas palavras-chave existam.
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Sequence[str], normalize: Callable[[str], str] = str.lower):
+        # normalize é aplicado igualmente às keywords e aos textos (ver rules.filter.fold_text)
+        self.keywords: List[str] = list(keywords)
+        self.normalize = normalize
+
+        # Estado 0 é a raiz. goto[s][ch] -> próximo estado; out[s] -> índices das keywords
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        normalized = [normalize(kw) for kw in self.keywords]
+        # kw vazia ("" in h) casa com qualquer texto, igual ao comportamento antigo
+        self._always: Tuple[int, ...] = tuple(i for i, kw in enumerate(normalized) if not kw)
+
+        outputs: List[List[int]] = [[]]
+        for idx, kw in enumerate(normalized):
+            if not kw:
+                continue
+            state = 0
+            for ch in kw:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                    self._goto[state][ch] = nxt
+                state = nxt
+            outputs[state].append(idx)
+
+        # BFS para os links de falha; a saída de cada estado herda a do seu fail.
+        # Filhos da raiz falham para a raiz (já é o valor inicial).
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                if state == 0:
+                    continue
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                outputs[nxt].extend(outputs[self._fail[nxt]])
+
+        self._out = [tuple(sorted(set(o))) for o in outputs]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def scan(self, text: str, found: Optional[Set[int]] = None) -> Set[int]:
+        """Índices das keywords presentes em text (já normalizado), acumulados em found."""
+        if found is None:
+            found = set()
+        found.update(self._always)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def match(self, haystacks: Iterable[str]) -> List[str]:
+        """Mesmos hits "KW:<termo>" do laço antigo, na ordem do vocabulário."""
+        found: Set[int] = set()
+        for h in haystacks:
+            self.scan(self.normalize(h), found)
+        return [f"KW:{self.keywords[i]}" for i in sorted(found)]
+
+
+@lru_cache(maxsize=4)
+def _build(
+    version: Optional[str], keywords: Tuple[str, ...], normalize: Callable[[str], str]
+) -> KeywordMatcher:
+    return KeywordMatcher(keywords, normalize=normalize)
+
+
+def build_keyword_matcher(
+    keywords: Sequence[str],
+    version: Optional[str] = None,
+    normalize: Callable[[str], str] = str.lower,
+) -> KeywordMatcher:
+    """Compila (ou reaproveita) o autômato para esta versão do vocabulário."""
+    return _build(version, tuple(keywords), normalize)
@@ -0,0 +1,112 @@
+"""
+src/semantic/backends.py
+Backends de inferência do SemanticEncoder, escolhidos em settings.yaml (nlp.encoder_backend):
+- torch: SentenceTransformer fp32 (padrão)
+- onnx:  o mesmo modelo exportado para ONNX e quantizado (int8 dinâmico), rodando no
+         onnxruntime em CPU. Gerar com: python -m tools.export_onnx
+"""
+
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("semantic.backends")
+
+
+class TorchBackend:
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.id = model_name
+        self.tokenizer = getattr(self.model, "tokenizer", None)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str], batch_size: int, normalize: bool) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=normalize,
+        )
+
+
+class OnnxBackend:
+    """
+    Reproduz o pipeline do sentence-transformers para este modelo
+    (Transformer -> mean pooling -> normalize opcional) sobre uma sessão onnxruntime.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        model_dir: str,
+        model_file: str = "model_int8.onnx",
+        max_seq_length: int = 128,
+        threads: Optional[int] = None,
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        path = Path(model_dir) / model_file
+        if not path.exists():
+            raise SystemExit(f"Modelo ONNX não encontrado em {path}. Rode: python -m tools.export_onnx")
+
+        opts = ort.SessionOptions()
+        if threads:
+            opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(path), opts, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.max_seq_length = max_seq_length
+        self._inputs = {i.name for i in self.session.get_inputs()}
+        self.id = f"{model_name}+onnx:{model_file}"
+        dim = self.session.get_outputs()[0].shape[-1]
+        self.dim = dim if isinstance(dim, int) else self.encode(["x"], 1, False).shape[1]
+
+    def encode(self, texts: List[str], batch_size: int, normalize: bool) -> np.ndarray:
+        out = []
+        for i in range(0, len(texts), batch_size):
+            enc = self.tokenizer(
+                texts[i:i + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feed = {k: v.astype(np.int64) for k, v in enc.items() if k in self._inputs}
+            token_emb = self.session.run(None, feed)[0]  # [batch, seq, dim]
+
+            mask = enc["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_emb * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            out.append(pooled.astype(np.float32))
+
+        emb = np.concatenate(out) if out else np.zeros((0, self.dim), np.float32)
+        if normalize:
+            emb = emb / np.clip(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12, None)
+        return emb
+
+
+def backend_id(model_name: str, nlp_cfg: Optional[dict] = None) -> str:
+    """O mesmo .id que build_backend produziria, sem carregar o modelo (chave dos caches)."""
+    nlp_cfg = nlp_cfg or {}
+    if nlp_cfg.get("encoder_backend", "torch") == "onnx":
+        return f"{model_name}+onnx:{nlp_cfg.get('onnx_model_file', 'model_int8.onnx')}"
+    return model_name
+
+
+def build_backend(model_name: str, nlp_cfg: Optional[dict] = None):
+    """Cria o backend configurado em settings.nlp (encoder_backend: torch | onnx)."""
+    nlp_cfg = nlp_cfg or {}
+    kind = nlp_cfg.get("encoder_backend", "torch")
+    if kind == "torch":
+        return TorchBackend(model_name)
+    if kind == "onnx":
+        return OnnxBackend(
+            model_name,
+            model_dir=nlp_cfg.get("onnx_model_dir", f"data/models/{model_name}-onnx"),
+            model_file=nlp_cfg.get("onnx_model_file", "model_int8.onnx"),
+            threads=nlp_cfg.get("onnx_threads"),
+        )
+    raise SystemExit(f"encoder_backend '{kind}' não suportado (use torch ou onnx).")
@@ -0,0 +1,129 @@
+"""
+src/semantic/embedding_store.py
+Cache persistente de embeddings dos comentários.
+Vetores em um np.memmap float16 (capacidade fixa) + índice lateral em SQLite
+(chave -> slot, último uso). Quando enche, os slots menos usados recentemente são reaproveitados.
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("semantic.embedding_store")
+
+
+def _slug(model_name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_.-]+", "_", model_name)
+
+
+class EmbeddingStore:
+    def __init__(self, directory: str, model_name: str, dim: int, capacity: int = 200_000):
+        self.model_name = model_name
+        self.dim = dim
+        self.dir = Path(directory) / _slug(model_name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+        self._db = sqlite3.connect(self.dir / "index.sqlite")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS slots ("
+            "key TEXT PRIMARY KEY, slot INTEGER NOT NULL UNIQUE, used INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS slots_used ON slots (used)")
+        self._db.commit()
+
+        # Nunca encolhe o arquivo: se já existe maior, mantém a capacidade antiga
+        path = self.dir / f"vectors-{dim}.f16"
+        row_bytes = dim * np.dtype(np.float16).itemsize
+        existing = path.stat().st_size // row_bytes if path.exists() else 0
+        self.capacity = max(capacity, existing)
+        if existing < self.capacity:
+            with open(path, "ab") as f:
+                f.truncate(self.capacity * row_bytes)
+        self._vectors = np.memmap(path, dtype=np.float16, mode="r+", shape=(self.capacity, dim))
+
+        used, last_slot = self._db.execute("SELECT MAX(used), MAX(slot) FROM slots").fetchone()
+        self._tick = used or 0
+        self._size = 0 if last_slot is None else last_slot + 1  # slots já entregues ao menos uma vez
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        h = hashlib.sha1()
+        h.update(self.model_name.encode("utf-8"))
+        h.update(b"\x00")
+        h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _lookup(self, keys: Sequence[str]) -> Dict[str, int]:
+        slots: Dict[str, int] = {}
+        # SQLite limita o nº de parâmetros por consulta
+        for i in range(0, len(keys), 500):
+            chunk = list(keys[i:i + 500])
+            marks = ",".join("?" * len(chunk))
+            slots.update(self._db.execute(
+                f"SELECT key, slot FROM slots WHERE key IN ({marks})", chunk
+            ).fetchall())
+        return slots
+
+    def _touch(self, keys: Sequence[str]):
+        self._db.executemany("UPDATE slots SET used = ? WHERE key = ?", [(self._tick, k) for k in keys])
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Vetores (float32) das chaves presentes; marca-as como usadas agora."""
+        uniq = list(dict.fromkeys(keys))
+        slots = self._lookup(uniq)
+        self._tick += 1
+        self._touch(list(slots))
+        self._db.commit()
+
+        self.hits += len(slots)
+        self.misses += len(uniq) - len(slots)
+        return {key: np.asarray(self._vectors[slot], dtype=np.float32) for key, slot in slots.items()}
+
+    def _free_slots(self, n: int) -> List[int]:
+        slots = list(range(self._size, min(self.capacity, self._size + n)))
+        self._size += len(slots)
+        missing = n - len(slots)
+        if missing > 0:
+            # Cheio: despeja os menos usados recentemente
+            rows = self._db.execute(
+                "SELECT key, slot FROM slots ORDER BY used LIMIT ?", (missing,)
+            ).fetchall()
+            self._db.executemany("DELETE FROM slots WHERE key = ?", [(k,) for k, _ in rows])
+            slots.extend(slot for _, slot in rows)
+        return slots
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray):
+        items = dict(zip(keys, vectors))
+        if not items:
+            return
+        # Mais itens do que a capacidade: só os últimos cabem
+        pairs = list(items.items())[-self.capacity:]
+
+        self._tick += 1
+        slots = self._lookup([k for k, _ in pairs])
+        # Marca as chaves já conhecidas antes de despejar, para não despejar a si mesmas
+        self._touch(list(slots))
+        fresh = [k for k, _ in pairs if k not in slots]
+        slots.update(zip(fresh, self._free_slots(len(fresh))))
+
+        for key, vec in pairs:
+            self._vectors[slots[key]] = np.asarray(vec, dtype=np.float16)
+        self._vectors.flush()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO slots (key, slot, used) VALUES (?, ?, ?)",
+            [(key, slots[key], self._tick) for key, _ in pairs],
+        )
+        self._db.commit()
+
+    def close(self):
+        self._vectors.flush()
+        self._db.close()
@@ -3,22 +3,182 @@ src/semantic/encoder.py
 Calcula a similaridade semântica entre o comentário e exemplos suspeitos.
 """
 
-from typing import List
-from sentence_transformers import SentenceTransformer, util
+import copy
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from semantic.index import build_index
 
 class SemanticEncoder:
-    def __init__(self, model_name: str, suspect_examples: List[str]):
-        # Carrega o modelo (multilíngue recomendado)
-        self.model = SentenceTransformer(model_name)
-        # Pré-codifica os exemplos para acelerar runtime
+    def __init__(
+        self,
+        model_name: str,
+        suspect_examples: List[str],
+        cache_dir: Optional[str] = None,
+        cache_capacity: int = 200_000,
+        examples_cache_dir: Optional[str] = None,
+        vocab_version: Optional[str] = None,
+        normalize: bool = True,
+        backend=None,
+        index_kind: str = "exact",
+        index_params: Optional[dict] = None,
+        examples_emb: Optional[np.ndarray] = None,
+    ):
+        # Carrega o modelo (multilíngue recomendado). Sem backend explícito, usa o
+        # SentenceTransformer em torch; ver semantic/backends.py para o ONNX int8.
+        if backend is None:
+            from semantic.backends import TorchBackend
+
+            backend = TorchBackend(model_name)
+        self.model_name = model_name
+        self.backend = backend
+        self.normalize = normalize
+        # Um encode por vez no backend: o tokenizer rápido do HF não aceita uso concorrente
+        # ("Already borrowed"). Compartilhado com as cópias de with_examples, que o
+        # VocabWatcher monta em outra thread enquanto o loop principal pontua.
+        self._encode_lock = threading.Lock()
+
+        # Cache persistente dos embeddings de comentários (ver embedding_store.py)
+        self.store = None
+        if cache_dir:
+            from semantic.embedding_store import EmbeddingStore
+
+            self.store = EmbeddingStore(
+                cache_dir,
+                backend.id,
+                dim=backend.dim,
+                capacity=cache_capacity,
+            )
+
+        # Pré-codifica os exemplos para acelerar runtime. Com examples_cache_dir e a
+        # versão do vocab, a matriz vem do disco (memmap) e só exemplos novos são codificados.
         self.examples = suspect_examples
-        self.examples_emb = self.model.encode(
-            suspect_examples, convert_to_tensor=True, normalize_embeddings=True
-        )
+        self.examples_cache_dir = examples_cache_dir
+        self.vocab_version = vocab_version
+        self.index_kind = index_kind
+        self.index_params = index_params or {}
+        if examples_emb is not None:
+            # Matriz já pronta (ex.: herdada do processo pai no backfill, copy-on-write)
+            self.examples_emb = examples_emb
+        elif examples_cache_dir and vocab_version:
+            from semantic.example_cache import load_or_build
+
+            self.examples_emb = load_or_build(
+                suspect_examples,
+                lambda texts: self._encode(texts, batch_size=64),
+                model_name=backend.id,
+                version=vocab_version,
+                normalize=normalize,
+                cache_dir=examples_cache_dir,
+            )
+        elif suspect_examples:
+            self.examples_emb = self._encode(suspect_examples, batch_size=64)
+        else:
+            self.examples_emb = np.zeros((0, backend.dim), np.float32)
+        self.index = self._build_index(self.index_kind, self.index_params)
+
+    def with_examples(self, suspect_examples: List[str], vocab_version: Optional[str] = None) -> "SemanticEncoder":
+        """
+        Cópia rasa (mesmo modelo, mesmo cache de embeddings) com outra lista de exemplos:
+        só os exemplos novos são codificados, os demais vêm da matriz atual (ou do cache
+        de exemplos em disco). O encoder atual não é alterado, então lotes em andamento
+        continuam com a lista antiga.
+        """
+        new = copy.copy(self)
+        new.examples = suspect_examples
+        new.vocab_version = vocab_version
+        if self.examples_cache_dir and vocab_version:
+            from semantic.example_cache import load_or_build
+
+            new.examples_emb = load_or_build(
+                suspect_examples,
+                lambda texts: self._encode(texts, batch_size=64),
+                model_name=self.backend.id,
+                version=vocab_version,
+                normalize=self.normalize,
+                cache_dir=self.examples_cache_dir,
+            )
+        elif suspect_examples:
+            known = {t: self.examples_emb[i] for i, t in enumerate(self.examples)}
+            added = [t for t in dict.fromkeys(suspect_examples) if t not in known]
+            if added:
+                known.update(zip(added, self._encode(added, batch_size=64)))
+            new.examples_emb = np.stack([np.asarray(known[t], dtype=np.float32) for t in suspect_examples])
+        else:
+            new.examples_emb = np.zeros((0, self.backend.dim), np.float32)
+        new.index = new._build_index(self.index_kind, self.index_params)
+        return new
+
+    def _build_index(self, kind: str, params: dict):
+        if len(self.examples_emb) == 0:
+            return None
+        # O índice trabalha com vetores unitários (cosseno = produto escalar);
+        # com normalize=True a própria matriz (memmap) é usada, sem cópia.
+        vectors = self.examples_emb
+        if not self.normalize:
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return build_index(vectors, kind, **params)
 
     def score(self, preprocessed_text: str) -> float:
-        if not preprocessed_text.strip():
-            return 0.0
-        emb = self.model.encode([preprocessed_text], convert_to_tensor=True, normalize_embeddings=True)
-        cos = util.cos_sim(emb, self.examples_emb)  # shape [1, N]
-        return float(cos.max().item())
+        return self.score_batch([preprocessed_text])[0]
+
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        tokenizer = self.backend.tokenizer
+        if tokenizer is None:
+            return [len(t.split()) for t in texts]
+        return [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Embeddings (float32), na ordem de texts, ordenando por tamanho no encode."""
+        with self._encode_lock:
+            lengths = self._token_lengths(texts)
+            order = sorted(range(len(texts)), key=lambda k: lengths[k])
+            emb = self.backend.encode([texts[k] for k in order], batch_size, self.normalize)
+        out = np.empty_like(emb, dtype=np.float32)
+        out[order] = emb
+        return out
+
+    def embed_batch(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Como _encode, mas consultando (e alimentando) o cache persistente, se houver."""
+        if self.store is None:
+            return self._encode(texts, batch_size)
+
+        keys = [self.store.key(t) for t in texts]
+        cached = self.store.get_many(keys)
+        missing = list(dict.fromkeys(k for k in keys if k not in cached))
+        if missing:
+            text_by_key = dict(zip(keys, texts))
+            # O store guarda float16: arredonda já na 1ª vez, mesmo score com ou sem cache hit
+            fresh = self._encode([text_by_key[k] for k in missing], batch_size)
+            fresh = fresh.astype(np.float16).astype(np.float32)
+            self.store.put_many(missing, fresh)
+            cached.update(zip(missing, fresh))
+        return np.stack([cached[k] for k in keys]).astype(np.float32)
+
+    def match_batch(self, preprocessed_texts: List[str], batch_size: int = 64) -> List[Tuple[float, Optional[int]]]:
+        """
+        (score, id do exemplo mais próximo) de cada texto, em um único fluxo de encode:
+        textos vazios não vão ao modelo (0.0, None), os já vistos vêm do cache de
+        embeddings, os demais são ordenados por nº de tokens (menos padding por lote)
+        e consultados no índice de exemplos de uma vez. O resultado volta na ordem original.
+        """
+        matches: List[Tuple[float, Optional[int]]] = [(0.0, None)] * len(preprocessed_texts)
+        idx = [i for i, t in enumerate(preprocessed_texts) if t.strip()]
+        if not idx or self.index is None:
+            return matches
+
+        emb = self.embed_batch([preprocessed_texts[i] for i in idx], batch_size=batch_size)
+        if not self.normalize:
+            emb = emb / np.clip(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12, None)
+        scores, ids = self.index.search(emb, k=1)
+
+        for pos, i in enumerate(idx):
+            best = int(ids[pos, 0])
+            matches[i] = (float(scores[pos, 0]), best) if best >= 0 else (0.0, None)
+        return matches
+
+    def score_batch(self, preprocessed_texts: List[str], batch_size: int = 64) -> List[float]:
+        """Só o score (máx. cosseno contra os exemplos) de match_batch."""
+        return [score for score, _ in self.match_batch(preprocessed_texts, batch_size)]
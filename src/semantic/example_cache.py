@@ -0,0 +1,122 @@
+"""
+src/semantic/example_cache.py
+Matriz de embeddings dos examples_implicit salva em disco, por
+(versão do vocab, modelo, normalize). No startup é aberta com np.load(mmap_mode="r"),
+sem cópia; quando a versão muda, só os exemplos novos são codificados.
+O .npy leva no nome o hash da lista de textos do .json: um .json só é casado com a matriz
+gerada para exatamente aqueles textos, mesmo após uma queda entre as duas gravações ou
+com dois processos gravando a mesma versão.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("semantic.example_cache")
+
+
+def _slug(s: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_.-]+", "_", s)
+
+
+def _paths(base: Path, version: str, normalize: bool) -> Path:
+    return base / f"examples-{_slug(version)}-{'norm' if normalize else 'raw'}.json"
+
+
+def _texts_hash(texts: List[str]) -> str:
+    return hashlib.sha1(json.dumps(texts, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _npy_path(json_path: Path, texts: List[str]) -> Path:
+    return json_path.with_name(f"{json_path.stem}-{_texts_hash(texts)}.npy")
+
+
+def _read(json_path: Path):
+    """(textos, matriz memmap) de um .json e do .npy do mesmo conteúdo; None se faltar/não bater."""
+    try:
+        texts = json.loads(json_path.read_text(encoding="utf-8"))
+        emb = np.load(_npy_path(json_path, texts), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if len(emb) != len(texts):
+        return None
+    return texts, emb
+
+
+def _latest_other(base: Path, normalize: bool, skip: Path) -> Optional[Path]:
+    suffix = f"-{'norm' if normalize else 'raw'}.json"
+    candidates = [p for p in base.glob(f"examples-*{suffix}") if p != skip]
+    return max(candidates, key=lambda p: p.stat().st_mtime) if candidates else None
+
+
+def load_or_build(
+    examples: List[str],
+    encode: Callable[[List[str]], np.ndarray],
+    model_name: str,
+    version: str,
+    normalize: bool,
+    cache_dir: str,
+) -> np.ndarray:
+    """
+    Retorna a matriz [len(examples), dim] (memmap somente leitura).
+    encode(textos) -> np.ndarray float32 é chamado só para os exemplos que
+    não estão no cache desta versão nem no da versão anterior.
+    """
+    base = Path(cache_dir) / _slug(model_name)
+    base.mkdir(parents=True, exist_ok=True)
+    json_path = _paths(base, version, normalize)
+
+    current = _read(json_path)
+    if current is not None and current[0] == list(examples):
+        logger.info("[Examples] cache hit (version=%s, n=%d)", version, len(examples))
+        return current[1]
+
+    # Reaproveita as linhas da versão mais recente em disco (a própria, se o conteúdo mudou)
+    known = {}
+    previous = current
+    if previous is None:
+        other = _latest_other(base, normalize, skip=json_path)
+        previous = _read(other) if other is not None else None
+    if previous is not None:
+        prev_texts, prev_emb = previous
+        known = {t: prev_emb[i] for i, t in enumerate(prev_texts)}
+
+    added = [t for t in dict.fromkeys(examples) if t not in known]
+    if added:
+        known.update(zip(added, encode(added)))
+    logger.info(
+        "[Examples] nova versão %s: %d reaproveitados, %d codificados",
+        version, len(examples) - len(added), len(added),
+    )
+
+    if examples:
+        matrix = np.stack([np.asarray(known[t], dtype=np.float32) for t in examples])
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+
+    # Escrita atômica, matriz antes da lista: o .json só aponta para um .npy já completo.
+    # Temporários por processo: dois escritores da mesma versão não se atropelam
+    texts = list(examples)
+    npy_path = _npy_path(json_path, texts)
+    tmp = npy_path.with_name(f"{npy_path.stem}.tmp-{os.getpid()}.npy")
+    np.save(tmp, matrix)
+    os.replace(tmp, npy_path)
+    json_tmp = json_path.with_name(f"{json_path.name}.tmp-{os.getpid()}")
+    json_tmp.write_text(json.dumps(texts, ensure_ascii=False), encoding="utf-8")
+    os.replace(json_tmp, json_path)
+
+    # Matrizes antigas desta versão (quem já as abriu em memmap continua lendo)
+    for old in base.glob(f"{json_path.stem}-{'[0-9a-f]' * 16}.npy"):
+        if old != npy_path:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+    return np.load(npy_path, mmap_mode="r")
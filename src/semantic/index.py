@@ -0,0 +1,121 @@
+"""
+src/semantic/index.py
+Índice de vizinho mais próximo sobre a matriz de exemplos (vetores normalizados,
+similaridade = produto escalar = cosseno).
+- ExactIndex: top-k exato em NumPy (argpartition), sem cópia da matriz.
+- IVFIndex:   aproximado; particiona os exemplos em listas por k-means (estilo IVF)
+              e guarda a matriz quantizada em int8 (escala por linha). Só as n_probe
+              listas mais próximas de cada consulta são varridas.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("semantic.index")
+
+
+class ExactIndex:
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def search(self, queries: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """(scores [n, k], ids [n, k]) em ordem decrescente de similaridade."""
+        k = min(k, len(self.vectors))
+        sims = queries @ self.vectors.T
+        if k == 1:
+            ids = sims.argmax(axis=1)[:, None]
+        else:
+            ids = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            order = np.argsort(-np.take_along_axis(sims, ids, axis=1), axis=1)
+            ids = np.take_along_axis(ids, order, axis=1)
+        return np.take_along_axis(sims, ids, axis=1), ids
+
+
+def _quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    scale = np.abs(vectors).max(axis=1) / 127.0
+    scale[scale == 0] = 1.0
+    q = np.round(vectors / scale[:, None]).astype(np.int8)
+    return q, scale.astype(np.float32)
+
+
+def _kmeans(vectors: np.ndarray, n_lists: int, iters: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means esférico simples (centróides normalizados)."""
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].astype(np.float32)
+    for _ in range(iters):
+        assign = (vectors @ centroids.T).argmax(axis=1)
+        for c in range(n_lists):
+            members = vectors[assign == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+            else:
+                centroids[c] = vectors[rng.integers(len(vectors))]
+        centroids /= np.clip(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12, None)
+    return centroids
+
+
+class IVFIndex:
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        iters: int = 10,
+        seed: int = 0,
+    ):
+        n = len(vectors)
+        self.n_lists = max(1, min(n, n_lists or int(np.sqrt(n))))
+        self.n_probe = max(1, min(n_probe, self.n_lists))
+
+        rng = np.random.default_rng(seed)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.centroids = _kmeans(vectors, self.n_lists, iters, rng)
+        assign = (vectors @ self.centroids.T).argmax(axis=1)
+
+        # Linhas agrupadas por lista: cada lista é uma fatia contígua de q/scale/ids
+        order = np.argsort(assign, kind="stable")
+        self.ids = order.astype(np.int64)
+        self.q, self.scale = _quantize(vectors[order])
+        counts = np.bincount(assign, minlength=self.n_lists)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, queries: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """(scores [n, k], ids [n, k]) aproximados; -inf/-1 onde há menos de k candidatos."""
+        queries = np.asarray(queries, dtype=np.float32)
+        n = len(queries)
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :self.n_probe]
+
+        scores = np.full((n, k), -np.inf, dtype=np.float32)
+        ids = np.full((n, k), -1, dtype=np.int64)
+        # Lista por lista: um produto matricial int8 contra todas as consultas que a sondam
+        for c in np.unique(probes):
+            lo, hi = self.offsets[c], self.offsets[c + 1]
+            if lo == hi:
+                continue
+            qs = np.nonzero((probes == c).any(axis=1))[0]
+            sims = (queries[qs] @ self.q[lo:hi].T.astype(np.float32)) * self.scale[lo:hi]
+
+            kk = min(k, hi - lo)
+            top = np.argpartition(-sims, kk - 1, axis=1)[:, :kk]
+            cand_s = np.concatenate([scores[qs], np.take_along_axis(sims, top, axis=1)], axis=1)
+            cand_i = np.concatenate([ids[qs], self.ids[lo + top]], axis=1)
+            keep = np.argsort(-cand_s, axis=1)[:, :k]
+            scores[qs] = np.take_along_axis(cand_s, keep, axis=1)
+            ids[qs] = np.take_along_axis(cand_i, keep, axis=1)
+        return scores, ids
+
+
+def build_index(vectors: np.ndarray, kind: str = "exact", **params):
+    """kind: exact | ivf (params do IVF: n_lists, n_probe, iters, seed)."""
+    if kind == "exact":
+        return ExactIndex(vectors)
+    if kind == "ivf":
+        return IVFIndex(vectors, **params)
+    raise SystemExit(f"example_index '{kind}' não suportado (use exact ou ivf).")
@@ -1,31 +1,339 @@
 """
 src/services/perspective.py
 Integração opcional com Google Perspective API para obter score de conteúdo sexual.
+
+- get_sexually_explicit_score: uma chamada bloqueante (uso pontual).
+- PerspectiveClient / get_sexually_explicit_scores: cliente assíncrono para lotes, com
+  sessão HTTP compartilhada (pool de conexões), limite de QPS (token bucket), concorrência
+  limitada, retry com backoff + jitter em 429/5xx e circuit breaker. Falhas viram None
+  (o agregador já trata Perspective ausente). Para testar localmente: tools/fake_perspective.py.
+  get_sexually_explicit_scores reusa um cliente por processo (por conjunto de opções), num
+  event loop próprio em thread: o limite de QPS vale entre lotes e a função pode ser chamada
+  de código que já roda dentro de um loop.
 """
 
+import asyncio
+import atexit
+import logging
 import os
+import random
+import threading
+import time
 import requests
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List
+
+from services.perspective_cache import PerspectiveCache, make_key
+
+logger = logging.getLogger("services.perspective")
 
 PERSPECTIVE_API_KEY = os.getenv("PERSPECTIVE_API_KEY", None)
-PERSPECTIVE_URL = "https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze"
+PERSPECTIVE_URL = os.getenv(
+    "PERSPECTIVE_URL", "https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze"
+)
+ATTRIBUTE = "SEXUALLY_EXPLICIT"
 
-def get_sexually_explicit_score(text: str, lang: str = "pt") -> Optional[float]:
-    if not PERSPECTIVE_API_KEY:
-        return None
 
-    payload: Dict[str, Any] = {
+def _payload(text: str, lang: str) -> Dict[str, Any]:
+    return {
         "comment": {"text": text},
         "languages": [lang],
-        "requestedAttributes": {"SEXUALLY_EXPLICIT": {}}
+        "requestedAttributes": {ATTRIBUTE: {}}
     }
 
-    params = {"key": PERSPECTIVE_API_KEY}
-    r = requests.post(PERSPECTIVE_URL, params=params, json=payload, timeout=10)
-    r.raise_for_status()
-    data = r.json()
+
+def _parse(data: Dict[str, Any]) -> Optional[float]:
     try:
-        val = data["attributeScores"]["SEXUALLY_EXPLICIT"]["summaryScore"]["value"]
+        val = data["attributeScores"][ATTRIBUTE]["summaryScore"]["value"]
         return float(val)
     except Exception:
         return None
+
+
+def get_sexually_explicit_score(text: str, lang: str = "pt", cache=None) -> Optional[float]:
+    if not PERSPECTIVE_API_KEY:
+        return None
+
+    if cache is not None:
+        key = make_key(text, lang, ATTRIBUTE)
+        cached = cache.get_many([key])
+        if key in cached:
+            return cached[key]
+
+    params = {"key": PERSPECTIVE_API_KEY}
+    r = requests.post(PERSPECTIVE_URL, params=params, json=_payload(text, lang), timeout=10)
+    r.raise_for_status()
+    score = _parse(r.json())
+    if cache is not None:
+        cache.put_many({key: score})
+    return score
+
+
+@dataclass
+class PerspectiveStats:
+    requests: int = 0       # requisições HTTP feitas (consomem cota), incluindo retries
+    retries: int = 0
+    throttled: int = 0      # respostas 429
+    failed: int = 0         # comentários que ficaram sem score após os retries
+    short_circuited: int = 0  # comentários não enviados com o circuito aberto
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else 0.0
+
+
+class TokenBucket:
+    """Limite de taxa assíncrono: rate fichas/s, até burst acumuladas."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Abre após `threshold` falhas seguidas; aberto, recusa chamadas por `reset_after`
+    segundos e então deixa uma passar (meio-aberto): sucesso fecha, falha reabre e
+    429 (throttled) devolve a vaga do teste, que volta a ser tentado após outro reset_after.
+    """
+
+    def __init__(self, threshold: int = 5, reset_after: float = 30.0):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if not self._trial and time.monotonic() - self.opened_at >= self.reset_after:
+            self._trial = True
+            return True
+        return False
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def throttled(self):
+        # 429 não conta como falha, mas o teste meio-aberto não pode ficar preso
+        if self._trial:
+            self.opened_at = time.monotonic()
+            self._trial = False
+
+    def failure(self):
+        self.failures += 1
+        if self._trial or self.failures >= self.threshold:
+            if self.opened_at is None or self._trial:
+                logger.warning("[Perspective] circuito aberto após %d falhas seguidas", self.failures)
+            self.opened_at = time.monotonic()
+            self._trial = False
+
+
+class PerspectiveClient:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        url: str = PERSPECTIVE_URL,
+        qps: float = 1.0,
+        concurrency: int = 8,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        timeout: float = 10.0,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+        stats: Optional[PerspectiveStats] = None,
+    ):
+        self.api_key = api_key if api_key is not None else PERSPECTIVE_API_KEY
+        self.url = url
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.bucket = TokenBucket(qps)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.stats = stats if stats is not None else PerspectiveStats()
+        self._sem = asyncio.Semaphore(concurrency)
+        self._session = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(self.backoff_max, float(retry_after))
+            except ValueError:
+                pass
+        # "full jitter": espalha os retries de requisições que falharam juntas
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def score(self, text: str, lang: str = "pt",
+                    stats: Optional[PerspectiveStats] = None) -> Optional[float]:
+        import aiohttp
+
+        if not self.api_key:
+            return None
+        stats = stats if stats is not None else self.stats
+        async with self._sem:
+            for attempt in range(self.max_retries + 1):
+                if not self.breaker.allow():
+                    stats.short_circuited += 1
+                    return None
+                await self.bucket.acquire()
+                stats.requests += 1
+                retry_after = None
+                throttled = False
+                try:
+                    async with self._session.post(
+                        self.url, params={"key": self.api_key}, json=_payload(text, lang)
+                    ) as r:
+                        if r.status == 200:
+                            self.breaker.success()
+                            return _parse(await r.json())
+                        if r.status != 429 and r.status < 500:
+                            # 4xx (ex.: idioma não suportado): não adianta repetir
+                            logger.debug("[Perspective] HTTP %d: %s", r.status, await r.text())
+                            self.breaker.success()
+                            stats.failed += 1
+                            return None
+                        if r.status == 429:
+                            stats.throttled += 1
+                            throttled = True
+                        retry_after = r.headers.get("Retry-After")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.debug("[Perspective] erro de rede: %s", e)
+
+                # 429 só pede calma (backoff); o circuito abre com 5xx/erros de rede
+                if throttled:
+                    self.breaker.throttled()
+                else:
+                    self.breaker.failure()
+                if attempt < self.max_retries:
+                    stats.retries += 1
+                    await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        stats.failed += 1
+        return None
+
+    async def score_many(self, texts: List[str], lang: str = "pt",
+                         stats: Optional[PerspectiveStats] = None) -> List[Optional[float]]:
+        return list(await asyncio.gather(*(self.score(t, lang, stats) for t in texts)))
+
+
+# Loop em thread + clientes compartilhados do processo (recriados após fork)
+_RUNNER_LOCK = threading.Lock()
+_RUNNER: Optional[tuple] = None  # (pid, loop)
+_CLIENTS: Dict[tuple, PerspectiveClient] = {}  # só acessado dentro do loop
+
+
+def _runner_loop() -> asyncio.AbstractEventLoop:
+    global _RUNNER
+    with _RUNNER_LOCK:
+        if _RUNNER is None or _RUNNER[0] != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="perspective-loop", daemon=True).start()
+            _CLIENTS.clear()
+            _RUNNER = (os.getpid(), loop)
+        return _RUNNER[1]
+
+
+async def _score_shared(options: Dict[str, Any], texts: List[str], lang: str,
+                        stats: PerspectiveStats) -> List[Optional[float]]:
+    key = tuple(sorted(options.items()))
+    client = _CLIENTS.get(key)
+    if client is None:
+        client = _CLIENTS[key] = await PerspectiveClient(**options).__aenter__()
+    return await client.score_many(texts, lang, stats)
+
+
+async def _close_clients():
+    clients = list(_CLIENTS.values())
+    _CLIENTS.clear()
+    for client in clients:
+        await client.__aexit__(None, None, None)
+
+
+@atexit.register
+def _shutdown():
+    if _RUNNER is not None and _RUNNER[0] == os.getpid():
+        try:
+            asyncio.run_coroutine_threadsafe(_close_clients(), _RUNNER[1]).result(timeout=5)
+        except Exception:
+            pass
+
+
+def get_sexually_explicit_scores(
+    texts: List[str],
+    lang: str = "pt",
+    stats: Optional[PerspectiveStats] = None,
+    cache_path: Optional[str] = None,
+    cache_ttl_days: float = 30,
+    cache_max_entries: int = 200_000,
+    cache_base_path: Optional[str] = None,
+    **options,
+) -> List[Optional[float]]:
+    """
+    Versão em lote (síncrona por fora) de get_sexually_explicit_score. Com cache_path,
+    consulta o PerspectiveCache antes e só envia os textos (distintos) que faltam;
+    options vão para o PerspectiveClient compartilhado do processo.
+    """
+    if not texts:
+        return []
+    stats = stats if stats is not None else PerspectiveStats()
+
+    keys = [make_key(t, lang, ATTRIBUTE) for t in texts]
+    known: Dict[str, Optional[float]] = {}
+    cache = None
+    if cache_path:
+        cache = PerspectiveCache(cache_path, ttl_days=cache_ttl_days, max_entries=cache_max_entries,
+                                 base_path=cache_base_path)
+        known = dict(cache.get_many(keys))
+        stats.cache_hits += cache.hits
+        stats.cache_misses += cache.misses
+
+    text_by_key = dict(zip(keys, texts))
+    missing = [k for k in dict.fromkeys(keys) if k not in known]
+
+    if missing:
+        future = asyncio.run_coroutine_threadsafe(
+            _score_shared(options, [text_by_key[k] for k in missing], lang, stats), _runner_loop()
+        )
+        fresh = dict(zip(missing, future.result()))
+        known.update(fresh)
+        if cache is not None:
+            cache.put_many(fresh)
+    if cache is not None:
+        cache.prune()
+        cache.close()
+    return [known[k] for k in keys]
@@ -0,0 +1,122 @@
+"""
+src/services/perspective_cache.py
+Cache persistente (SQLite) dos scores da Perspective API, na frente de
+get_sexually_explicit_score(s). A chave é o hash de (atributo, idioma, texto), então o
+mesmo comentário re-pontuado em outra execução ou repostado não gasta cota de novo.
+- TTL: entradas mais velhas que ttl_days são ignoradas e apagadas no prune.
+- Teto: além de max_entries, as entradas mais antigas saem primeiro.
+Falhas (score None) não são guardadas, para serem tentadas de novo na próxima execução.
+Processos em paralelo (backfill): cada um grava no seu arquivo, lendo o principal só para
+leitura (base_path); no fim o principal incorpora os arquivos com merge().
+"""
+
+import hashlib
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger("services.perspective_cache")
+
+
+def make_key(text: str, lang: str, attribute: str) -> str:
+    h = hashlib.sha1()
+    for part in (attribute, lang, text):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class PerspectiveCache:
+    def __init__(self, path: str, ttl_days: float = 30, max_entries: int = 200_000,
+                 base_path: Optional[str] = None):
+        self.ttl = float(ttl_days) * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db: Optional[sqlite3.Connection] = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "key TEXT PRIMARY KEY, value REAL NOT NULL, created REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS scores_created ON scores (created)")
+        self._db.commit()
+        self._base: Optional[sqlite3.Connection] = None
+        if base_path and Path(base_path).exists():
+            self._base = sqlite3.connect(f"file:{base_path}?mode=ro", uri=True)
+
+    def _lookup(self, db: sqlite3.Connection, keys: List[str], cutoff: float) -> Dict[str, float]:
+        found: Dict[str, float] = {}
+        # SQLite limita o nº de parâmetros por consulta
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = db.execute(
+                f"SELECT key, value FROM scores WHERE key IN ({marks}) AND created >= ?",
+                [*chunk, cutoff],
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, float]:
+        """Retorna {key: score} para as chaves presentes e dentro do TTL."""
+        uniq = list(dict.fromkeys(keys))
+        cutoff = time.time() - self.ttl
+        found = self._lookup(self._db, uniq, cutoff)
+        if self._base is not None:
+            found.update(self._lookup(self._base, [k for k in uniq if k not in found], cutoff))
+        self.hits += len(found)
+        self.misses += len(uniq) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, Optional[float]]):
+        now = time.time()
+        rows = [(key, float(value), now) for key, value in items.items() if value is not None]
+        if rows:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO scores (key, value, created) VALUES (?, ?, ?)", rows
+            )
+            self._db.commit()
+
+    def prune(self) -> int:
+        """Apaga expiradas e o excedente de max_entries (mais antigas primeiro). Retorna quantas saíram."""
+        cur = self._db.execute("DELETE FROM scores WHERE created < ?", (time.time() - self.ttl,))
+        removed = cur.rowcount
+        (count,) = self._db.execute("SELECT COUNT(*) FROM scores").fetchone()
+        if count > self.max_entries:
+            cur = self._db.execute(
+                "DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY created LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            removed += cur.rowcount
+        self._db.commit()
+        return removed
+
+    def merge(self, paths: Iterable[str]) -> int:
+        """Incorpora outros arquivos de cache (a entrada mais nova vence). Retorna quantas linhas vieram."""
+        merged = 0
+        for path in paths:
+            self._db.execute("ATTACH DATABASE ? AS other", (path,))
+            try:
+                cur = self._db.execute(
+                    "INSERT INTO scores (key, value, created) "
+                    "SELECT key, value, created FROM other.scores WHERE true "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, created = excluded.created "
+                    "WHERE excluded.created > scores.created"
+                )
+                merged += cur.rowcount
+                self._db.commit()
+            finally:
+                self._db.execute("DETACH DATABASE other")
+        return merged
+
+    def close(self):
+        if self._base is not None:
+            self._base.close()
+            self._base = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,6 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from pydantic import BaseModel
+import hashlib
 import json
+import threading
 from pathlib import Path
 
 # uvicorn src.services.vocab_api.main:app --reload --port 8001
@@ -15,7 +17,43 @@ class VocabResponse(BaseModel):
     regex_patterns: dict
     version: str
 
+
+class VocabStore:
+    """
+    vocab.json já parseado em memória; só relê quando mtime/tamanho do arquivo mudam.
+    O ETag é o hash do conteúdo (não do mtime), então salvar o mesmo conteúdo não invalida os clientes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self.data: dict = {}
+        self.etag = ""
+
+    def get(self):
+        st = self.path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    raw = self.path.read_bytes()
+                    data = json.loads(raw.decode("utf-8"))
+                    digest = hashlib.sha1(raw).hexdigest()
+                    data.setdefault("version", digest[:12])
+                    self.data, self.etag, self._stamp = data, f'"{digest}"', stamp
+        return self.data, self.etag
+
+
+_store = VocabStore(VOCAB_PATH)
+
+
 @app.get("/v1/vocab", response_model=VocabResponse)
-def get_vocab():
-    data = json.loads(VOCAB_PATH.read_text(encoding="utf-8"))
+def get_vocab(request: Request, response: Response):
+    data, etag = _store.get()
+    headers = {"ETag": etag, "X-Vocab-Version": data["version"], "Cache-Control": "no-cache"}
+    inm = request.headers.get("if-none-match", "")
+    if etag in [t.strip() for t in inm.split(",")] or inm.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     return data
@@ -1,14 +1,69 @@
 """
 src/services/vocab_client.py
+Busca o vocabulário na Vocab API guardando uma cópia local (VOCAB_CACHE_PATH) com o ETag:
+- cópia com menos de VOCAB_CACHE_MAX_AGE segundos: usada sem ir à rede;
+- senão, GET condicional (If-None-Match); 304 -> usa a cópia;
+- serviço fora do ar / erro HTTP: usa a cópia, se houver (com aviso).
 """
 
+import json
+import logging
 import os
+import time
+from pathlib import Path
 import requests
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("services.vocab_client")
 
 VOCAB_URL = os.getenv("VOCAB_API_URL", "http://localhost:8001/v1/vocab")
+VOCAB_CACHE_PATH = os.getenv("VOCAB_CACHE_PATH", "data/cache/vocab.json")
+VOCAB_CACHE_MAX_AGE = float(os.getenv("VOCAB_CACHE_MAX_AGE", "60"))
+
+
+def _read_cache(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path: Path, etag: Optional[str], vocab: Dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"etag": etag, "vocab": vocab}, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def fetch_vocab(
+    url: str = VOCAB_URL,
+    cache_path: Optional[str] = VOCAB_CACHE_PATH,
+    max_age: float = VOCAB_CACHE_MAX_AGE,
+) -> Dict[str, Any]:
+    if not cache_path:
+        r = requests.get(url, timeout=10)
+        r.raise_for_status()
+        return r.json()
+
+    path = Path(cache_path)
+    cached = _read_cache(path)
+    if cached and max_age > 0 and time.time() - path.stat().st_mtime < max_age:
+        return cached["vocab"]
+
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+    try:
+        r = requests.get(url, headers=headers, timeout=(3, 10))
+        if r.status_code == 304 and cached:
+            path.touch()  # revalidada agora: reinicia o max_age
+            return cached["vocab"]
+        r.raise_for_status()
+        vocab = r.json()
+    except requests.RequestException as e:
+        if cached:
+            logger.warning("[Vocab] API indisponível (%s); usando cópia local (version=%s)",
+                           e, cached["vocab"].get("version"))
+            return cached["vocab"]
+        raise
 
-def fetch_vocab() -> Dict[str, Any]:
-    r = requests.get(VOCAB_URL, timeout=10)
-    r.raise_for_status()
-    return r.json()
+    _write_cache(path, r.headers.get("ETag"), vocab)
+    return vocab
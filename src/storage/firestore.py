@@ -1,6 +1,6 @@
 # src/storage/firestore.py
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 from google.cloud import firestore
 
 def get_client():
@@ -48,3 +48,8 @@ def save_records(client, collection: str, records: List) -> Tuple[int, int]:
     if ops_in_batch:
         batch.commit()
     return (len(records), 0)
+
+def iter_documents(client, collection: str) -> Iterator[Dict[str, Any]]:
+    """Percorre a coleção inteira em streaming (usado no backfill)."""
+    for snap in client.collection(collection).stream():
+        yield snap.to_dict()
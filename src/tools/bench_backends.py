@@ -0,0 +1,84 @@
+# src/tools/bench_backends.py
+"""
+Throughput (comentários/s) e memória residente (pico de RSS) de cada backend do
+SemanticEncoder. Cada backend roda em um processo próprio, para o RSS não se misturar.
+
+    cd src && python -m tools.bench_backends
+    cd src && python -m tools.bench_backends --comments 2000 --backends torch,onnx
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+
+from tools.bench_encoder import make_comments
+
+MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+EXAMPLES = ["tem carinha de bebê", "acabou de virar mulher", "mal saiu da escola"]
+
+
+def _rss_mb() -> float:
+    # ru_maxrss vem em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(kind: str, n: int, batch_size: int, seed: int):
+    from common.config import load_settings
+    from semantic.backends import build_backend
+    from semantic.encoder import SemanticEncoder
+
+    nlp_cfg = {**load_settings().nlp, "encoder_backend": kind}
+    t0 = time.perf_counter()
+    enc = SemanticEncoder(MODEL_NAME, EXAMPLES, backend=build_backend(MODEL_NAME, nlp_cfg))
+    load_s = time.perf_counter() - t0
+
+    comments = make_comments(n, random.Random(seed))
+    enc.score_batch(comments[:8])  # aquece
+    t0 = time.perf_counter()
+    enc.score_batch(comments, batch_size=batch_size)
+    elapsed = time.perf_counter() - t0
+
+    print(json.dumps({
+        "backend": kind,
+        "load_s": load_s,
+        "comments_per_s": n / elapsed,
+        "rss_mb": _rss_mb(),
+    }))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de backends do encoder (throughput e RSS)")
+    ap.add_argument("--comments", type=int, default=1000)
+    ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--backends", default="torch,onnx")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        run_child(args.child, args.comments, args.batch_size, args.seed)
+        return
+
+    print(f"{'backend':<8} {'carga (s)':>10} {'com/s':>10} {'RSS pico (MB)':>14}")
+    for kind in [b for b in args.backends.split(",") if b]:
+        proc = subprocess.run(
+            [sys.executable, "-m", "tools.bench_backends", "--child", kind,
+             "--comments", str(args.comments), "--batch-size", str(args.batch_size),
+             "--seed", str(args.seed)],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            err = (proc.stderr.strip().splitlines() or ["?"])[-1]
+            print(f"{kind:<8} erro: {err}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{kind:<8} {r['load_s']:>10.2f} {r['comments_per_s']:>10.1f} {r['rss_mb']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
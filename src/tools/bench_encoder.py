@@ -0,0 +1,81 @@
+# src/tools/bench_encoder.py
+"""
+Compara comentários/s do laço antigo (um model.encode + cos_sim por comentário, como o
+SemanticEncoder.score fazia antes do score_batch; reproduzido aqui em old_score) com
+SemanticEncoder.score_batch (encode em lote, ordenado por tamanho).
+
+    cd src && python -m tools.bench_encoder
+    cd src && python -m tools.bench_encoder --comments 2000 --batch-size 128
+"""
+
+import argparse
+import random
+import time
+
+from semantic.encoder import SemanticEncoder
+from services.vocab_client import fetch_vocab
+
+MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+
+WORDS = (
+    "vídeo ótimo parabéns conteúdo carinha bebê idade escola mulher novinha "
+    "flor cresceu rápido boneca trabalho canal inscrito like comentário kkkk"
+).split()
+
+
+def make_comments(n: int, rng: random.Random):
+    out = []
+    for _ in range(n):
+        if rng.random() < 0.05:
+            out.append("")  # comentário que vira vazio após o pré-processamento
+            continue
+        out.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 40))))
+    return out
+
+
+def old_score(model, examples_emb, preprocessed_text: str) -> float:
+    """SemanticEncoder.score antigo: um encode por comentário, sem cache nem índice."""
+    if not preprocessed_text.strip():
+        return 0.0
+    from sentence_transformers import util
+
+    emb = model.encode([preprocessed_text], convert_to_tensor=True, normalize_embeddings=True)
+    cos = util.cos_sim(emb, examples_emb)  # shape [1, N]
+    return float(cos.max().item())
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark do encoder: laço vs score_batch")
+    ap.add_argument("--comments", type=int, default=500)
+    ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    try:
+        examples = fetch_vocab().get("examples_implicit", [])
+    except Exception:
+        examples = ["tem carinha de bebê", "acabou de virar mulher", "mal saiu da escola"]
+
+    enc = SemanticEncoder(MODEL_NAME, examples)
+    model = enc.backend.model
+    examples_emb = model.encode(examples, convert_to_tensor=True, normalize_embeddings=True)
+    comments = make_comments(args.comments, random.Random(args.seed))
+    enc.score_batch(comments[:8])  # aquece o modelo
+
+    t0 = time.perf_counter()
+    loop_scores = [old_score(model, examples_emb, c) for c in comments]
+    loop_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch_scores = enc.score_batch(comments, batch_size=args.batch_size)
+    batch_s = time.perf_counter() - t0
+
+    drift = max(abs(a - b) for a, b in zip(loop_scores, batch_scores))
+    print(f"comentários: {len(comments)} | batch_size: {args.batch_size}")
+    print(f"laço score():   {len(comments) / loop_s:>8.1f} com/s")
+    print(f"score_batch():  {len(comments) / batch_s:>8.1f} com/s  ({loop_s / batch_s:.1f}x)")
+    print(f"maior diferença de score: {drift:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# src/tools/bench_perspective.py
+"""
+Compara o laço antigo (get_sexually_explicit_score, um POST bloqueante por comentário)
+com o PerspectiveClient assíncrono, contra o servidor falso de tools/fake_perspective.py
+subido no próprio processo. Confere também que os scores batem.
+
+    cd src && python -m tools.bench_perspective
+    cd src && python -m tools.bench_perspective --comments 1000 --latency 0.2 --server-qps 50 --qps 40 --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import services.perspective as perspective
+from services.perspective import PerspectiveClient, PerspectiveStats
+from tools.fake_perspective import fake_score, make_app, start
+from tools.bench_encoder import make_comments
+
+
+async def _bench(args):
+    app = make_app(args.latency, args.server_qps, args.error_rate)
+    runner, url = await start(app)
+    comments = [c or "vazio" for c in make_comments(args.comments, random.Random(args.seed))]
+    try:
+        # Laço antigo só numa amostra (é linear no nº de comentários)
+        sample = comments[:args.loop_sample]
+        perspective.PERSPECTIVE_API_KEY = "fake"
+        perspective.PERSPECTIVE_URL = url
+        t0 = time.perf_counter()
+        for c in sample:
+            try:
+                await asyncio.to_thread(perspective.get_sexually_explicit_score, c)
+            except Exception:
+                pass  # 429/5xx abortariam a execução antiga
+        loop_s = (time.perf_counter() - t0) / max(1, len(sample)) * len(comments)
+
+        stats = PerspectiveStats()
+        t0 = time.perf_counter()
+        async with PerspectiveClient(
+            api_key="fake",
+            url=url,
+            qps=args.qps,
+            concurrency=args.concurrency,
+            stats=stats,
+            backoff_base=0.1,
+        ) as client:
+            scores = await client.score_many(comments)
+        async_s = time.perf_counter() - t0
+    finally:
+        await runner.cleanup()
+
+    wrong = sum(1 for c, s in zip(comments, scores) if s is not None and abs(s - fake_score(c)) > 1e-9)
+    print(f"comentários: {len(comments)} | latência: {args.latency}s | 429 acima de {args.server_qps or '∞'} QPS")
+    print(f"laço bloqueante (estimado): {loop_s:>8.1f}s")
+    print(f"cliente assíncrono:         {async_s:>8.1f}s  ({loop_s / async_s:.1f}x)")
+    print(f"sem score: {sum(s is None for s in scores)} | scores errados: {wrong}")
+    print(f"stats: {stats}")
+    print(f"servidor: {app['counters']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark do cliente Perspective: laço vs assíncrono")
+    ap.add_argument("--comments", type=int, default=300)
+    ap.add_argument("--latency", type=float, default=0.1)
+    ap.add_argument("--server-qps", type=float, default=0.0, help="servidor responde 429 acima disso")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--qps", type=float, default=100.0, help="token bucket do cliente")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--loop-sample", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=42)
+    asyncio.run(_bench(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# src/tools/bench_reddit_fetch.py
+"""
+Compara os dois caminhos de coleta de comentários de um post do Reddit:
+- praw: reddit.fetch_submission_comments (Submission + comments.list() + atributos lazy)
+- raw:  reddit_raw.fetch_submission_comments_raw (JSON cru, árvore percorrida em largura)
+em comentários/s e pico de memória alocada (tracemalloc), e confere que os dicts batem.
+
+Por padrão roda contra um servidor local que serve uma árvore sintética no formato da API
+(token, /comments/<id>); com --live usa a API real (REDDIT_CLIENT_ID/SECRET no .env).
+
+    cd src && python -m tools.bench_reddit_fetch --comments 5000
+    cd src && python -m tools.bench_reddit_fetch --live 1abcde
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+SUBMISSION_ID = "bench1"
+
+
+def make_tree(n: int, seed: int = 42):
+    """Listagem /comments/<id> com n comentários (até 4 níveis de resposta)."""
+    rng = random.Random(seed)
+    count = [0]
+
+    def comment(parent: str, depth: int):
+        count[0] += 1
+        cid = f"c{count[0]}"
+        data = {
+            "id": cid, "name": f"t1_{cid}", "parent_id": parent, "link_id": f"t3_{SUBMISSION_ID}",
+            "author": rng.choice(["user_a", "user_b", "user_c", None]) or "[deleted]",
+            "body": " ".join(rng.choice(["kkkk", "linda", "parabéns", "vídeo", "ótimo"]) for _ in range(rng.randint(3, 30))),
+            "score": rng.randint(-5, 500), "created_utc": 1_700_000_000 + count[0],
+            "permalink": f"/r/brasil/comments/{SUBMISSION_ID}/x/{cid}/", "subreddit": "brasil",
+            "replies": "",
+        }
+        kids = []
+        if depth < 4:
+            for _ in range(rng.randint(0, 3)):
+                if count[0] >= n:
+                    break
+                kids.append(comment(data["name"], depth + 1))
+        if kids:
+            data["replies"] = {"kind": "Listing", "data": {"children": kids, "after": None, "before": None}}
+        return {"kind": "t1", "data": data}
+
+    roots = []
+    while count[0] < n:
+        roots.append(comment(f"t3_{SUBMISSION_ID}", 0))
+    post = {"kind": "t3", "data": {
+        "id": SUBMISSION_ID, "name": f"t3_{SUBMISSION_ID}", "title": "bench", "subreddit": "brasil",
+        "author": "op", "num_comments": n, "permalink": f"/r/brasil/comments/{SUBMISSION_ID}/x/",
+        "created_utc": 1_700_000_000, "selftext": "",
+    }}
+    return [
+        {"kind": "Listing", "data": {"children": [post], "after": None, "before": None}},
+        {"kind": "Listing", "data": {"children": roots, "after": None, "before": None}},
+    ]
+
+
+def serve(payload):
+    body = json.dumps(payload).encode("utf-8")
+    token = json.dumps({"access_token": "x", "token_type": "bearer", "expires_in": 3600, "scope": "*"}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, data: bytes):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self._send(token)
+
+        def do_GET(self):
+            path = urlparse(self.path).path.rstrip("/")
+            self._send(body if path.startswith("/comments/") else b'{"json": {"data": {"things": []}}}')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark da coleta do Reddit: PRAW vs JSON cru")
+    ap.add_argument("--comments", type=int, default=5000)
+    ap.add_argument("--live", metavar="SUBMISSION_ID", help="usa a API real neste post")
+    ap.add_argument("--more-budget", type=int, default=0, help="raw: chamadas morechildren (0 = igual ao PRAW)")
+    args = ap.parse_args()
+
+    import praw
+    from ingestion.reddit import fetch_submission_comments
+    from ingestion.reddit_raw import RawRedditClient, fetch_submission_comments_raw, get_raw_client
+    from ingestion.reddit_client import get_client
+
+    if args.live:
+        sid = args.live
+        reddit, raw_client = get_client(), get_raw_client()
+    else:
+        sid = SUBMISSION_ID
+        server, url = serve(make_tree(args.comments))
+        reddit = praw.Reddit(client_id="x", client_secret="y", user_agent="bench",
+                             oauth_url=url, reddit_url=url, check_for_async=False)
+        raw_client = RawRedditClient("x", "y", "bench", reddit_url=url, oauth_url=url)
+
+    limit = 0  # sem teto: a árvore inteira
+    praw_rows, praw_s, praw_peak = measure(
+        lambda: fetch_submission_comments(sid, limit=limit, sort="new", reddit=reddit))
+    raw_rows, raw_s, raw_peak = measure(
+        lambda: fetch_submission_comments_raw(sid, limit=limit, sort="new",
+                                              more_budget=args.more_budget, client=raw_client))
+
+    n = len(praw_rows)
+    print(f"comentários: praw={n} | raw={len(raw_rows)} | iguais: {praw_rows == raw_rows[:n]}")
+    print(f"praw: {n / praw_s:>9.0f} com/s | pico {praw_peak / 2**20:6.1f} MiB")
+    print(f"raw:  {len(raw_rows) / raw_s:>9.0f} com/s | pico {raw_peak / 2**20:6.1f} MiB  "
+          f"({praw_s / raw_s:.1f}x mais rápido, {praw_peak / max(raw_peak, 1):.1f}x menos memória)")
+
+
+if __name__ == "__main__":
+    main()
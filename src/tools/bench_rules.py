@@ -0,0 +1,85 @@
+# src/tools/bench_rules.py
+"""
+Compara o laço antigo de palavras-chave (kw.lower() in h) com o autômato
+Aho–Corasick de rules.matcher, para vocabulários de 10, 1.000 e 50.000 termos.
+
+    cd src && python -m tools.bench_rules
+    cd src && python -m tools.bench_rules --comments 2000 --sizes 10,1000,50000
+"""
+
+import argparse
+import random
+import string
+import time
+from typing import List
+
+from rules.matcher import KeywordMatcher
+
+VOCAB_WORDS = [
+    "novinha", "ninfeta", "lolita", "grooming", "baby face", "corpo de mulher",
+    "parabéns", "vídeo", "conteúdo", "carinha", "escola", "idade",
+]
+
+
+def _word(rng: random.Random, lo: int = 4, hi: int = 10) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(lo, hi)))
+
+
+def make_keywords(n: int, rng: random.Random) -> List[str]:
+    kws = list(VOCAB_WORDS[: min(n, len(VOCAB_WORDS))])
+    while len(kws) < n:
+        kws.append(_word(rng) if rng.random() < 0.7 else f"{_word(rng)} {_word(rng)}")
+    return kws
+
+
+def make_comments(n: int, rng: random.Random) -> List[str]:
+    out = []
+    for _ in range(n):
+        words = [_word(rng, 2, 8) for _ in range(rng.randint(5, 30))]
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(VOCAB_WORDS))
+        out.append(" ".join(words).capitalize())
+    return out
+
+
+def naive(text: str, pre: str, keywords: List[str]) -> List[str]:
+    haystacks = [text.lower(), pre.lower()]
+    return [f"KW:{kw}" for kw in keywords if any(kw.lower() in h for h in haystacks)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de palavras-chave: laço vs Aho–Corasick")
+    ap.add_argument("--comments", type=int, default=1000)
+    ap.add_argument("--sizes", default="10,1000,50000")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    comments = make_comments(args.comments, rng)
+    pairs = [(c, c.lower()) for c in comments]
+
+    print(f"{'keywords':>9} {'build (ms)':>11} {'laço (com/s)':>14} {'autômato (com/s)':>17} {'ganho':>7}")
+    for size in [int(x) for x in args.sizes.split(",") if x]:
+        keywords = make_keywords(size, rng)
+
+        t0 = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        expected = [naive(t, p, keywords) for t, p in pairs]
+        naive_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        got = [matcher.match([t, p]) for t, p in pairs]
+        ac_s = time.perf_counter() - t0
+
+        assert got == expected, "autômato divergiu do laço antigo"
+        print(
+            f"{size:>9} {build_ms:>11.1f} {len(pairs) / naive_s:>14.0f} "
+            f"{len(pairs) / ac_s:>17.0f} {naive_s / ac_s:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# src/tools/bench_startup.py
+"""
+Mede o custo de import de cada estágio do pipeline, cada um em um processo novo
+(sem cache de módulos), para acompanhar o tempo de startup do main.py.
+
+    cd src && python -m tools.bench_startup
+    cd src && python -m tools.bench_startup --repeat 5 --load
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+SRC_DIR = Path(__file__).parents[1]
+
+# (estágio, código medido). O import do main.py deve ficar perto de "config".
+STAGES: List[Tuple[str, str]] = [
+    ("config", "import common.config"),
+    ("main (CLI)", "import main"),
+    ("vocab", "import services.vocab_client"),
+    ("ingestion.youtube", "import ingestion.youtube; import googleapiclient.discovery"),
+    ("ingestion.reddit", "import ingestion.reddit"),
+    ("preprocess (spaCy)", "import preprocess.text; import spacy"),
+    ("rules", "import rules.filter"),
+    ("semantic (sentence-transformers)", "import semantic.encoder; import sentence_transformers"),
+    ("perspective", "import services.perspective"),
+    ("storage (Firestore)", "import storage.firestore"),
+]
+
+# Com --load, mede também a carga dos modelos (não só o import).
+LOAD_STAGES: List[Tuple[str, str]] = [
+    ("load spaCy", "from preprocess.text import Preprocessor; Preprocessor('pt_core_news_sm')"),
+    (
+        "load encoder",
+        "from semantic.encoder import SemanticEncoder; "
+        "SemanticEncoder('paraphrase-multilingual-MiniLM-L12-v2', ['exemplo'])",
+    ),
+]
+
+TEMPLATE = (
+    "import time, sys; sys.path.insert(0, {src!r}); t0 = time.perf_counter()\n"
+    "{code}\n"
+    "print(time.perf_counter() - t0)"
+)
+
+
+def measure(code: str) -> float:
+    proc = subprocess.run(
+        [sys.executable, "-c", TEMPLATE.format(src=str(SRC_DIR), code=code)],
+        capture_output=True,
+        text=True,
+        cwd=SRC_DIR,
+    )
+    if proc.returncode != 0:
+        err = (proc.stderr.strip().splitlines() or ["?"])[-1]
+        raise RuntimeError(err)
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de startup por estágio")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--load", action="store_true", help="Inclui a carga dos modelos")
+    args = ap.parse_args()
+
+    stages = STAGES + (LOAD_STAGES if args.load else [])
+    print(f"{'estágio':<36} {'mediana (ms)':>12} {'min (ms)':>10}")
+    for name, code in stages:
+        try:
+            times = [measure(code) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{name:<36} {'erro':>12}  {e}")
+            continue
+        print(f"{name:<36} {statistics.median(times) * 1000:>12.1f} {min(times) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
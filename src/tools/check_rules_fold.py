@@ -0,0 +1,74 @@
+# src/tools/check_rules_fold.py
+"""
+Precisão do fold de grafias evasivas (RuleEngine com fold=True, rules.fold_evasive):
+- casos fixos: grafias evasivas que devem casar e palavras comuns que não podem casar
+  com keywords de letra dobrada ("tween" x "twenty", "grooming" x "groming")
+- comentários sintéticos (tools.bench_rules): os hits com fold são sempre um
+  superconjunto dos hits sem fold; os hits só do fold são listados para revisão
+
+Sai com código 1 se alguma checagem falhar.
+
+    cd src && python -m tools.check_rules_fold
+    cd src && python -m tools.check_rules_fold --comments 5000 --show 20
+"""
+
+import argparse
+import random
+import sys
+
+from rules.filter import RuleEngine
+from tools.bench_rules import VOCAB_WORDS, make_comments
+
+KEYWORDS = VOCAB_WORDS + ["tween", "teen", "lolla"]
+
+# (texto, keyword que tem de casar ou None se nenhuma pode casar)
+CASES = [
+    ("que novinhaaa linda", "novinha"),
+    ("olha a n1nf3ta", "ninfeta"),
+    ("ninféta no clipe", "ninfeta"),
+    ("l0lita", "lolita"),
+    ("isso é groooming", "grooming"),
+    ("grooming de menores", "grooming"),
+    ("uma tweeeen", "tween"),
+    ("twenty years later", None),
+    ("ten years later", None),
+    ("groming the dog", None),
+    ("a lola chegou", None),
+]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Precisão do fold de grafias evasivas nas keywords")
+    ap.add_argument("--comments", type=int, default=2000)
+    ap.add_argument("--show", type=int, default=10, help="hits só do fold listados")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    plain = RuleEngine(KEYWORDS, {}, fold=False)
+    folded = RuleEngine(KEYWORDS, {}, fold=True)
+
+    ok = True
+    for text, expected in CASES:
+        hits = folded.match(text, text)
+        good = hits == [f"KW:{expected}"] if expected else not hits
+        ok = ok and good
+        print(f"{'OK    ' if good else 'FALHOU'} | {text!r:28} -> {hits}")
+
+    extra = 0
+    for text in make_comments(args.comments, random.Random(args.seed)):
+        a, b = plain.match(text, text), folded.match(text, text)
+        if not set(a) <= set(b):
+            ok = False
+            print(f"FALHOU | perdeu hits com fold: {text!r} | {a} -> {b}")
+        if set(b) - set(a):
+            extra += 1
+            if extra <= args.show:
+                print(f"só fold | {text!r} -> {sorted(set(b) - set(a))}")
+
+    print(f"comentários: {args.comments} | com hits só do fold: {extra}")
+    print(f"Precisão do fold {'OK' if ok else 'FALHOU'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# src/tools/export_onnx.py
+"""
+Exporta o modelo do SemanticEncoder para ONNX e gera a versão quantizada (int8 dinâmico)
+usada pelo backend "onnx" (semantic/backends.py).
+
+    cd src && python -m tools.export_onnx
+    cd src && python -m tools.export_onnx --out ../data/models/paraphrase-multilingual-MiniLM-L12-v2-onnx
+
+Depois, em configs/settings.yaml:
+    nlp:
+      encoder_backend: onnx
+      onnx_model_dir: data/models/paraphrase-multilingual-MiniLM-L12-v2-onnx
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+log = logging.getLogger("export_onnx")
+
+MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+
+
+def export(model_name: str, out_dir: Path, opset: int = 17):
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    st = SentenceTransformer(model_name, device="cpu")
+    transformer = st[0].auto_model.eval()
+    tokenizer = st.tokenizer
+    tokenizer.save_pretrained(out_dir)
+
+    sample = tokenizer(["exemplo de comentário"], return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+    dynamic = {n: {0: "batch", 1: "seq"} for n in input_names}
+    dynamic["last_hidden_state"] = {0: "batch", 1: "seq"}
+
+    fp32_path = out_dir / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[n] for n in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic,
+            opset_version=opset,
+        )
+    log.info("ONNX fp32 salvo em %s", fp32_path)
+
+    int8_path = out_dir / "model_int8.onnx"
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    log.info("ONNX int8 salvo em %s", int8_path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Exporta o encoder para ONNX int8")
+    ap.add_argument("--model", default=MODEL_NAME)
+    ap.add_argument("--out", default=None, help="Diretório de saída (default: data/models/<modelo>-onnx)")
+    ap.add_argument("--opset", type=int, default=17)
+    args = ap.parse_args()
+
+    out = Path(args.out) if args.out else Path(__file__).parents[2] / "data" / "models" / f"{args.model}-onnx"
+    export(args.model, out, opset=args.opset)
+
+
+if __name__ == "__main__":
+    main()
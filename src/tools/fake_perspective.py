@@ -0,0 +1,134 @@
+# src/tools/fake_perspective.py
+"""
+Servidor local que imita o endpoint comments:analyze da Perspective API, para testar
+o PerspectiveClient sem gastar cota: latência configurável, 429 acima de um QPS
+(com Retry-After) e uma fração de 5xx. O score é um hash determinístico do texto.
+script: status fixos para as primeiras requisições (ex.: [503, 503, 429]), depois o normal.
+
+Cenários (--scenario) sobem o servidor e um PerspectiveClient no mesmo processo e conferem
+o comportamento do cliente; saem com código 1 se falhar:
+- breaker-trial-429: 503s abrem o circuito, o teste meio-aberto recebe 429 e depois o
+  servidor volta ao normal; o cliente tem de voltar a pontuar.
+
+    cd src && python -m tools.fake_perspective --port 8002 --latency 0.2 --qps 5
+    cd src && python -m tools.fake_perspective --scenario breaker-trial-429
+    PERSPECTIVE_URL=http://localhost:8002/v1alpha1/comments:analyze PERSPECTIVE_API_KEY=x python main.py ...
+
+O bench (tools/bench_perspective.py) sobe este mesmo servidor em processo.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import sys
+import time
+from typing import List, Optional
+
+from aiohttp import web
+
+PATH = "/v1alpha1/comments:analyze"
+
+
+def fake_score(text: str) -> float:
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:4], 16) / 0xFFFF
+
+
+def make_app(latency: float = 0.1, qps: float = 0.0, error_rate: float = 0.0, seed: int = 0,
+             script: Optional[List[int]] = None) -> web.Application:
+    rng = random.Random(seed)
+    script = list(script or [])
+    window = []  # instantes das requisições aceitas no último segundo
+    counters = {"requests": 0, "throttled": 0, "errors": 0}
+
+    async def analyze(request: web.Request) -> web.Response:
+        counters["requests"] += 1
+        if script:
+            status = script.pop(0)
+            if status == 429:
+                counters["throttled"] += 1
+                return web.json_response({"error": {"code": 429}}, status=429, headers={"Retry-After": "0"})
+            if status != 200:
+                counters["errors"] += 1
+                return web.json_response({"error": {"code": status}}, status=status)
+        now = time.monotonic()
+        while window and now - window[0] > 1.0:
+            window.pop(0)
+        if qps and len(window) >= qps:
+            counters["throttled"] += 1
+            return web.json_response({"error": {"code": 429}}, status=429, headers={"Retry-After": "1"})
+        window.append(now)
+
+        await asyncio.sleep(latency * rng.uniform(0.5, 1.5))
+        if rng.random() < error_rate:
+            counters["errors"] += 1
+            return web.json_response({"error": {"code": 503}}, status=503)
+
+        body = await request.json()
+        text = body["comment"]["text"]
+        return web.json_response({
+            "attributeScores": {"SEXUALLY_EXPLICIT": {"summaryScore": {"value": fake_score(text)}}}
+        })
+
+    app = web.Application()
+    app["counters"] = counters
+    app.router.add_post(PATH, analyze)
+    return app
+
+
+async def start(app: web.Application, port: int = 0):
+    """Sobe o app em 127.0.0.1 (port=0: porta livre). Retorna (runner, url)."""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}{PATH}"
+
+
+async def _breaker_trial_429() -> bool:
+    from services.perspective import PerspectiveClient
+
+    reset = 0.2
+    app = make_app(latency=0.0, script=[503, 503, 503, 429])
+    runner, url = await start(app)
+    try:
+        async with PerspectiveClient(api_key="fake", url=url, qps=100.0, max_retries=0,
+                                     breaker_threshold=3, breaker_reset=reset) as client:
+            for i in range(3):
+                await client.score(f"erro {i}")
+            opened = client.breaker.opened_at is not None
+            await asyncio.sleep(reset)
+            trial = await client.score("teste meio-aberto")  # recebe o 429
+            await asyncio.sleep(reset)
+            score = await client.score("servidor saudável")
+            stats = client.stats
+    finally:
+        await runner.cleanup()
+    ok = opened and trial is None and score == fake_score("servidor saudável")
+    print(f"circuito abriu: {opened} | teste com 429: {trial} | depois: {score}")
+    print(f"stats: {stats}")
+    print(f"servidor: {app['counters']}")
+    return ok
+
+
+SCENARIOS = {"breaker-trial-429": _breaker_trial_429}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Perspective API falsa (latência/429/5xx)")
+    ap.add_argument("--scenario", choices=sorted(SCENARIOS), help="roda um cenário contra o cliente e sai")
+    ap.add_argument("--port", type=int, default=8002)
+    ap.add_argument("--latency", type=float, default=0.1, help="segundos por requisição (±50%%)")
+    ap.add_argument("--qps", type=float, default=0.0, help="acima disso responde 429 (0 = sem limite)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fração de respostas 503")
+    args = ap.parse_args()
+    if args.scenario:
+        ok = asyncio.run(SCENARIOS[args.scenario]())
+        print(f"{args.scenario}: {'OK' if ok else 'FALHOU'}")
+        sys.exit(0 if ok else 1)
+    web.run_app(make_app(args.latency, args.qps, args.error_rate), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# src/tools/parity_cascade.py
+"""
+Paridade da cascata (classify.cascade): os mesmos comentários pontuados com a cascata
+desligada e ligada, com os estágios e opções do settings.yaml (build_stages + score_options):
+- mesmo label final em todos os comentários
+- sinal semântico pulado pela cascata fica None (não 0.0)
+
+Entrada: comentários do smoke test (tools/smoke_teste.MOCK_COMMENTS) ou um JSONL com
+{comment_id, text} por linha (--input, ex.: a saída do backfill). Sai com código 1 se
+alguma checagem falhar.
+
+    cd src && python -m tools.parity_cascade
+    cd src && python -m tools.parity_cascade --input rescored.jsonl --limit 5000
+"""
+
+import argparse
+import json
+import logging
+import sys
+from itertools import islice
+from typing import Dict, List
+
+from common.config import load_settings
+from services.vocab_client import fetch_vocab
+from classify.scoring import CascadeStats, build_stages, score_options, score_texts
+from tools.smoke_teste import MOCK_COMMENTS
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+log = logging.getLogger("parity_cascade")
+
+
+def _load(path: str, limit: int) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        lines = (line for line in f if line.strip())
+        return [json.loads(line) for line in islice(lines, limit)]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Paridade de labels: cascata desligada vs ligada")
+    ap.add_argument("--input", help="JSONL com {comment_id, text} por linha (default: mocks do smoke test)")
+    ap.add_argument("--limit", type=int, default=1000, help="máximo de comentários lidos do --input")
+    args = ap.parse_args()
+
+    settings = load_settings()
+    vocab = fetch_vocab()
+    pre, rules, enc = build_stages(settings, vocab)
+    items = _load(args.input, args.limit) if args.input else MOCK_COMMENTS
+    texts = [item.get("text") or "" for item in items]
+
+    options = score_options(settings)
+    full = score_texts(texts, pre, rules, enc, settings.thresholds, **{**options, "cascade": False})
+    stats = CascadeStats()
+    cascaded = score_texts(
+        texts, pre, rules, enc, settings.thresholds, **{**options, "cascade": True, "stats": stats}
+    )
+
+    failed = 0
+    for item, ref, got in zip(items, full, cascaded):
+        problems = []
+        if ref.classification != got.classification:
+            problems.append(f"label {ref.classification} → {got.classification}")
+        if "semantic" in got.skipped and got.semantic_score is not None:
+            problems.append(f"semântico pulado gravado como {got.semantic_score}")
+        if problems:
+            failed += 1
+            log.warning("%s | %s | pulados=%s", item.get("comment_id"), "; ".join(problems), got.skipped)
+
+    log.info(
+        "Cascata → semântico: %d chamadas (%d evitadas) | Perspective: %d chamadas (%d evitadas)",
+        stats.semantic_calls, stats.semantic_saved, stats.perspective_calls, stats.perspective_saved,
+    )
+    log.info("Paridade %s (%d comentários, %d divergentes)", "OK" if not failed else "FALHOU", len(items), failed)
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
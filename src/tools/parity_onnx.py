@@ -0,0 +1,61 @@
+# src/tools/parity_onnx.py
+"""
+Paridade entre os backends torch (fp32) e onnx (int8) do SemanticEncoder,
+nos comentários do smoke test (tools/smoke_teste.MOCK_COMMENTS):
+- drift do semantic_score por comentário <= --tolerance
+- mesmo label final (classify.scoring) nos dois backends
+
+Sai com código 1 se alguma checagem falhar.
+
+    cd src && python -m tools.parity_onnx
+    cd src && python -m tools.parity_onnx --tolerance 0.03
+"""
+
+import argparse
+import dataclasses
+import logging
+import sys
+
+from common.config import load_settings
+from services.vocab_client import fetch_vocab
+from classify.scoring import build_stages, score_texts
+from tools.smoke_teste import MOCK_COMMENTS
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+log = logging.getLogger("parity_onnx")
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Paridade torch vs onnx int8 no smoke test")
+    ap.add_argument("--tolerance", type=float, default=0.02, help="drift máximo de semantic_score")
+    args = ap.parse_args()
+
+    settings = load_settings()
+    vocab = fetch_vocab()
+    texts = [item["text"] for item in MOCK_COMMENTS]
+
+    scored = {}
+    for kind in ("torch", "onnx"):
+        # Estágios do run_pipeline, só trocando o backend do encoder
+        pre, rules, enc = build_stages(
+            dataclasses.replace(settings, nlp={**settings.nlp, "encoder_backend": kind}), vocab
+        )
+        scored[kind] = score_texts(texts, pre, rules, enc, settings.thresholds)
+
+    ok = True
+    for item, ref, got in zip(MOCK_COMMENTS, scored["torch"], scored["onnx"]):
+        drift = abs(ref.semantic_score - got.semantic_score)
+        same_label = ref.classification == got.classification
+        status = "OK" if drift <= args.tolerance and same_label else "FALHOU"
+        ok = ok and status == "OK"
+        log.info(
+            "%s | torch=%.4f (%s) | onnx=%.4f (%s) | drift=%.4f | %s",
+            item["comment_id"], ref.semantic_score, ref.classification,
+            got.semantic_score, got.classification, drift, status,
+        )
+
+    log.info("Paridade %s (tolerância=%.3f)", "OK" if ok else "FALHOU", args.tolerance)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())